@@ -0,0 +1,99 @@
+import pygame, json, os
+from settings import *
+
+# Build step: `python atlas.py` packs every sprite strip into a few atlas pages
+# and writes a manifest of where each strip's frames landed. The strips are
+# whatever the entities' ANIMATIONS tables (and meteor strips) load.
+# At startup load_atlas() opens those pages once and primes load_strip's cache
+# with subsurfaces of them, so the entities never open the individual files.
+
+ATLAS_DIR = "build/atlas"
+MANIFEST_PATH = os.path.join(ATLAS_DIR, "manifest.json")
+PAGE_SIZE = 2048
+PADDING = 1
+
+def sprite_strips():
+    """Every (path, frame_count, frame_w, frame_h) the entities pass to load_strip."""
+    from player import Player
+    from bosses import PapiaBoss, HarusBoss
+    tables = [Player.ANIMATIONS, PapiaBoss.ANIMATIONS, HarusBoss.ANIMATIONS, HarusBoss.SHOCKWAVE_ANIMATION]
+    strips = [args[:4] for table in tables for args in table.values()]
+    strips += [PapiaBoss.METEOR_STRIP, HarusBoss.METEOR_STRIP]
+    return list(dict.fromkeys(strips))
+
+def _pack(sizes):
+    # Shelf packer: tallest frames first, rows left to right, new page when full
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placed = [None] * len(sizes)
+    page, x, y, shelf_h = 0, 0, 0, 0
+    page_heights = [0]
+
+    for i in order:
+        w, h = sizes[i]
+        if x + w > PAGE_SIZE:
+            x, y, shelf_h = 0, y + shelf_h + PADDING, 0
+        if y + h > PAGE_SIZE:
+            page, x, y, shelf_h = page + 1, 0, 0, 0
+            page_heights.append(0)
+        placed[i] = (page, x, y)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+        page_heights[page] = max(page_heights[page], y + h)
+    return placed, page_heights
+
+def build_atlas():
+    frames, owners, sources, strips = [], [], {}, []
+    for path, count, fw, fh in sprite_strips():
+        sources[path] = file_stamp(path)
+        sheet = pygame.image.load(path)
+        w = fw or sheet.get_width() // count
+        h = fh or sheet.get_height()
+        entry = {"args": [path, count, fw, fh], "frames": []}
+        strips.append(entry)
+        for i in range(count):
+            frames.append(sheet.subsurface((i * w, 0, w, h)))
+            owners.append(entry)
+
+    placed, page_heights = _pack([f.get_size() for f in frames])
+    pages = [pygame.Surface((PAGE_SIZE, h), pygame.SRCALPHA) for h in page_heights]
+    # Frames keep strip order in the manifest even though packing reorders them
+    for frame, entry, (page, x, y) in zip(frames, owners, placed):
+        pages[page].blit(frame, (x, y))
+        entry["frames"].append([page, x, y, frame.get_width(), frame.get_height()])
+
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    page_files = []
+    for i, page in enumerate(pages):
+        name = f"page{i}.png"
+        pygame.image.save(page, os.path.join(ATLAS_DIR, name))
+        page_files.append(name)
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump({"pages": page_files, "sources": sources, "strips": strips}, f, indent=1)
+    return len(frames), len(pages)
+
+def load_atlas():
+    """Prime the strip cache from the built atlas. Returns False if it is missing or stale."""
+    try:
+        with open(MANIFEST_PATH) as f:
+            data = json.load(f)
+        for path, stamp in data["sources"].items():
+            if file_stamp(path) != stamp:
+                print(f"Atlas is stale ({path} changed), loading strips individually")
+                return False
+        pages = []
+        for name in data["pages"]:
+            page_path = os.path.join(ATLAS_DIR, name)
+            pages.append(prime_sheet(page_path, load_image(page_path), scene="atlas"))
+    except (OSError, ValueError, KeyError, pygame.error):
+        return False
+
+    for entry in data["strips"]:
+        frames = [pages[page].subsurface((x, y, w, h)) for page, x, y, w, h in entry["frames"]]
+        prime_strip(*entry["args"], frames, scene="atlas")
+    return True
+
+if __name__ == "__main__":
+    pygame.init()
+    n_frames, n_pages = build_atlas()
+    print(f"Packed {n_frames} frames into {n_pages} page(s) -> {MANIFEST_PATH}")
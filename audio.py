@@ -0,0 +1,131 @@
+import pygame, json, os, threading
+from settings import file_stamp, load_once
+
+# Central sound bank. Every SFX file is decoded once per process and shared.
+# One-shots are capped per sound and only ever use the unreserved mixer
+# channels; looping sounds (Papia's whisper, Harus's footsteps) get a reserved
+# channel each, so a burst of one-shots can never cut a loop off.
+#
+# When `python bake.py` has been run, load() reads the baked copy of a sound
+# instead: already in the mixer's format and with trailing silence trimmed, so
+# SDL has nothing to convert at load time.
+
+# Output format the mixer is opened with (main.py) and the bake converts to
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_OUTPUT_CHANNELS = 2
+
+MIXER_CHANNELS = 16
+LOOP_CHANNELS = 2
+
+# Played with Sfx.loop(); the bake keeps their length intact and compresses them
+LOOPED_SFX = {
+    "assets/SFX/PAPIA IDLE CARELESS WHISPERS.wav",
+    "assets/SFX/BIG FOOTSTEPS(arush).wav",
+}
+
+BAKED_SFX_DIR = "build/sfx"
+# Baked loops are padded to whole ADPCM blocks; the fact chunk has the real length
+os.environ.setdefault("SDL_WAVE_FACT_CHUNK", "truncate")
+BAKED_SFX_INDEX = os.path.join(BAKED_SFX_DIR, "index.json")
+
+class Sfx:
+    """A decoded sound plus its playback limits. Use through the SoundBank."""
+    def __init__(self, bank, sound, max_voices):
+        self.bank = bank
+        self.sound = sound
+        self.max_voices = max_voices
+
+    def play(self):
+        return self.bank.play(self)
+
+    def loop(self):
+        return self.bank.loop(self)
+
+    def stop(self):
+        self.bank.stop(self)
+
+class SoundBank:
+    def __init__(self):
+        self.sfx = {}          # path -> Sfx, or None if it failed to load
+        self.loops = {}        # Sfx -> reserved Channel it is looping on
+        self.free_loop_channels = []
+        self.voice_channels = []  # unreserved channels for one-shots
+        self.voice_started = []   # play order per voice channel, to steal the oldest
+        self.plays = 0
+        self.baked = None
+        self.lock = threading.Lock()
+
+    def init(self, channels=MIXER_CHANNELS, loop_channels=LOOP_CHANNELS):
+        """Call once after pygame.mixer.init()."""
+        if not pygame.mixer.get_init(): return
+        pygame.mixer.set_num_channels(channels)
+        pygame.mixer.set_reserved(loop_channels)
+        self.free_loop_channels = [pygame.mixer.Channel(i) for i in range(loop_channels)]
+        self.voice_channels = [pygame.mixer.Channel(i) for i in range(loop_channels, channels)]
+        self.voice_started = [0] * len(self.voice_channels)
+
+    def source_for(self, path):
+        """The baked copy of `path` if it is up to date, else `path` itself."""
+        if self.baked is None:
+            try:
+                with open(BAKED_SFX_INDEX) as f:
+                    self.baked = json.load(f)
+            except (OSError, ValueError):
+                self.baked = {}
+        entry = self.baked.get(path)
+        try:
+            if entry and entry["stamp"] == file_stamp(path):
+                return os.path.join(BAKED_SFX_DIR, entry["file"])
+        except OSError:
+            pass
+        return path
+
+    def load(self, path, volume=None, max_voices=2):
+        """
+        Decode `path` the first time it is asked for. None if the file or mixer
+        is missing. volume and max_voices are set by that first load, so every
+        caller of one path should pass the same ones (keep them in an SFX table).
+        """
+        if not pygame.mixer.get_init(): return None
+        return load_once(self.sfx, path, self.lock, lambda: self.decode(path, volume, max_voices))[0]
+
+    def decode(self, path, volume, max_voices):
+        # A file that fails is cached as None, so it only warns once
+        try:
+            sound = pygame.mixer.Sound(self.source_for(path))
+        except (pygame.error, OSError) as e:
+            print(f"Sound Warning: {path}: {e}")
+            return None
+        if volume is not None: sound.set_volume(volume)
+        return Sfx(self, sound, max_voices)
+
+    def play(self, sfx):
+        if not self.voice_channels: return None
+        if sfx.sound.get_num_channels() - (sfx in self.loops) >= sfx.max_voices:
+            return None
+        # Idle channel first, otherwise steal the oldest one-shot. This is done
+        # by hand because find_channel(True) may also steal a reserved channel.
+        idle = [i for i, c in enumerate(self.voice_channels) if not c.get_busy()]
+        i = idle[0] if idle else min(range(len(self.voice_channels)), key=self.voice_started.__getitem__)
+        self.plays += 1
+        self.voice_started[i] = self.plays
+        self.voice_channels[i].play(sfx.sound)
+        return self.voice_channels[i]
+
+    def loop(self, sfx):
+        if sfx in self.loops: return self.loops[sfx]
+        if not self.free_loop_channels:
+            print("Sound Warning: no free loop channel")
+            return None
+        channel = self.loops[sfx] = self.free_loop_channels.pop()
+        channel.play(sfx.sound, loops=-1)
+        return channel
+
+    def stop(self, sfx):
+        channel = self.loops.pop(sfx, None)
+        if channel:
+            channel.stop()
+            self.free_loop_channels.append(channel)
+
+sounds = SoundBank()
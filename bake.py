@@ -0,0 +1,202 @@
+import pygame, array, glob, hashlib, json, os, struct, sys
+from settings import *
+from audio import *
+
+# Offline bake: `python bake.py` decodes every PNG once and stores the pixels
+# in load_image's raw cache (see settings.py), keyed by the PNG's content hash.
+# It also bakes every SFX into the mixer's native format (see audio.py):
+# trailing silence is trimmed from one-shots, and long loops are
+# stored IMA-ADPCM compressed, which SDL decodes on load.
+# Run it again after editing assets; unchanged files are skipped.
+
+def bake_sources():
+    paths = sorted(glob.glob("assets/**/*.png", recursive=True))
+    # Atlas pages are baked too when they exist
+    paths += sorted(glob.glob("build/atlas/*.png"))
+    return paths
+
+def bake_pixels(paths):
+    os.makedirs(PIXEL_CACHE_DIR, exist_ok=True)
+    try:
+        with open(PIXEL_INDEX_PATH) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    baked = skipped = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        out_path = os.path.join(PIXEL_CACHE_DIR, digest + ".px")
+        index[path] = {"stamp": file_stamp(path), "hash": digest}
+        if os.path.exists(out_path):
+            skipped += 1
+            continue
+
+        surf = pygame.image.load(path)
+        w, h = surf.get_size()
+        with open(out_path, "wb") as f:
+            f.write(PIXEL_HEADER.pack(PIXEL_MAGIC, w, h))
+            f.write(pygame.image.tobytes(surf, "RGBA"))
+        baked += 1
+
+    # Drop sources that no longer exist, then any pixel file nothing points at
+    index = {p: e for p, e in index.items() if os.path.exists(p)}
+    live = {e["hash"] + ".px" for e in index.values()}
+    for name in os.listdir(PIXEL_CACHE_DIR):
+        if name.endswith(".px") and name not in live:
+            os.remove(os.path.join(PIXEL_CACHE_DIR, name))
+
+    with open(PIXEL_INDEX_PATH, "w") as f:
+        json.dump(index, f, indent=1)
+    return baked, skipped
+
+# --- Audio ---
+SILENCE_THRESHOLD = 64   # |sample| at or below this counts as silence (about -54 dBFS)
+SILENCE_PAD = 0.005      # seconds kept after the last audible sample
+ADPCM_BLOCK_ALIGN = 2048
+
+IMA_INDEX_TABLE = [-1, -1, -1, -1, 2, 4, 6, 8, -1, -1, -1, -1, 2, 4, 6, 8]
+IMA_STEP_TABLE = [
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41, 45,
+    50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190, 209, 230,
+    253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724, 796, 876, 963,
+    1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272, 2499, 2749, 3024, 3327,
+    3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132, 7845, 8630, 9493, 10442,
+    11487, 12635, 13899, 15289, 16818, 18500, 20350, 22385, 24623, 27086, 29794,
+    32767,
+]
+
+def trim_silence(samples, channels):
+    """Cut the silence after the last audible sample, on a frame boundary.
+    The lead-in stays: sounds are played on the frame their action starts,
+    so it is part of their timing."""
+    last = len(samples) - 1
+    while last >= 0 and abs(samples[last]) <= SILENCE_THRESHOLD: last -= 1
+    if last < 0: return samples[:0]
+    pad = int(SILENCE_PAD * MIXER_FREQUENCY) * channels
+    return samples[:min(len(samples), last - last % channels + channels + pad)]
+
+def _ima_encode_channel(samples, predictor, index):
+    """Encode samples for one channel; returns (nibbles, predictor, index)."""
+    nibbles = []
+    for sample in samples:
+        step = IMA_STEP_TABLE[index]
+        diff = sample - predictor
+        code = 0
+        if diff < 0:
+            code = 8
+            diff = -diff
+        delta = step >> 3
+        if diff >= step: code |= 4; diff -= step; delta += step
+        step >>= 1
+        if diff >= step: code |= 2; diff -= step; delta += step
+        step >>= 1
+        if diff >= step: code |= 1; delta += step
+        predictor += -delta if code & 8 else delta
+        predictor = max(-32768, min(32767, predictor))
+        index = max(0, min(88, index + IMA_INDEX_TABLE[code]))
+        nibbles.append(code)
+    return nibbles, predictor, index
+
+def encode_ima_adpcm(samples, channels):
+    """Interleaved int16 samples -> (IMA ADPCM data, samples per block)."""
+    per_block = (ADPCM_BLOCK_ALIGN - 4 * channels) * 2 // channels + 1
+    n_frames = len(samples) // channels
+    # SDL drops a short final block, so pad it with the loop's first frames.
+    # The fact chunk keeps the true length (audio.py tells SDL to honour it)
+    tail = -n_frames % per_block
+    samples = samples + samples[:tail * channels]
+    n_frames += tail
+    out = bytearray()
+    index = [0] * channels
+    for block_start in range(0, n_frames, per_block):
+        frames = min(per_block, n_frames - block_start)
+        coded = []
+        for c in range(channels):
+            chan = samples[block_start * channels + c:(block_start + frames) * channels:channels]
+            # The block header carries the first sample verbatim
+            out += struct.pack("<hBB", chan[0], index[c], 0)
+            nibbles, _, index[c] = _ima_encode_channel(chan[1:], chan[0], index[c])
+            nibbles += [0] * (-len(nibbles) % 8)
+            coded.append(nibbles)
+        # 4 bytes (8 samples) per channel, interleaved; low nibble first
+        for word in range(0, len(coded[0]), 8):
+            for c in range(channels):
+                n = coded[c][word:word + 8]
+                out += bytes(n[i] | (n[i + 1] << 4) for i in range(0, 8, 2))
+    return bytes(out), per_block
+
+def write_adpcm_wav(path, samples, channels, rate):
+    n_frames = len(samples) // channels
+    data, per_block = encode_ima_adpcm(samples, channels)
+    # SDL garbles the last frames of every channel but the first when the fact
+    # length stops partway through a group of 8 samples, so round it up to the
+    # end of one: under 8 more frames, taken from the loop's start like the padding
+    if n_frames % per_block: n_frames += -(n_frames % per_block - 1) % 8
+    avg_bytes = rate * ADPCM_BLOCK_ALIGN // per_block
+    fmt = struct.pack("<HHIIHHHH", 0x11, channels, rate, avg_bytes, ADPCM_BLOCK_ALIGN, 4, 2, per_block)
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 12 + 8 + len(data)) + b"WAVE")
+        f.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+        f.write(b"fact" + struct.pack("<II", 4, n_frames))
+        f.write(b"data" + struct.pack("<I", len(data)) + data)
+
+def write_pcm_wav(path, samples, channels, rate):
+    data = samples.tobytes()
+    fmt = struct.pack("<HHIIHH", 1, channels, rate, rate * channels * 2, channels * 2, 16)
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + len(data)) + b"WAVE")
+        f.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+        f.write(b"data" + struct.pack("<I", len(data)) + data)
+
+def bake_audio(paths):
+    """Bake each SFX; returns rows of (path, source bytes, baked bytes, resident bytes before, after)."""
+    os.makedirs(BAKED_SFX_DIR, exist_ok=True)
+    pygame.mixer.quit()
+    pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_OUTPUT_CHANNELS)
+    rate, _, channels = pygame.mixer.get_init()
+
+    index, report = {}, []
+    for path in paths:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        looped = path in LOOPED_SFX
+        name = f"{digest}{'.adpcm' if looped else ''}.wav"
+        out_path = os.path.join(BAKED_SFX_DIR, name)
+        index[path] = {"stamp": file_stamp(path), "file": name}
+
+        # Letting SDL load the source converts it to the mixer's rate, sample
+        # format and channel count, exactly as it would at runtime
+        resident_before = pygame.mixer.Sound(path).get_length()
+        samples = array.array("h", pygame.mixer.Sound(path).get_raw())
+        if sys.byteorder == "big": samples.byteswap()
+        if not os.path.exists(out_path):
+            if looped:
+                # Loops keep their silence: it is part of the rhythm
+                write_adpcm_wav(out_path, samples, channels, rate)
+            else:
+                write_pcm_wav(out_path, trim_silence(samples, channels), channels, rate)
+        resident_after = pygame.mixer.Sound(out_path).get_length()
+        to_bytes = rate * channels * 2
+        report.append((path, os.path.getsize(path), os.path.getsize(out_path),
+                       int(resident_before * to_bytes), int(resident_after * to_bytes)))
+
+    live = {e["file"] for e in index.values()}
+    for name in os.listdir(BAKED_SFX_DIR):
+        if name.endswith(".wav") and name not in live:
+            os.remove(os.path.join(BAKED_SFX_DIR, name))
+    with open(BAKED_SFX_INDEX, "w") as f:
+        json.dump(index, f, indent=1)
+    return report
+
+if __name__ == "__main__":
+    pygame.init()
+    baked, skipped = bake_pixels(bake_sources())
+    print(f"Pixels: baked {baked}, up to date {skipped} -> {PIXEL_CACHE_DIR}")
+
+    print(f"Audio -> {BAKED_SFX_DIR}")
+    print(f"  {'file':32} {'disk':>19} {'resident':>19}")
+    for path, src, out, mem_before, mem_after in bake_audio(sorted(glob.glob("assets/SFX/*.wav"))):
+        saved = 100 * (src - out) // max(1, src)
+        print(f"  {os.path.basename(path):32} {src // 1024:6} -> {out // 1024:5} KB {mem_before // 1024:6} -> {mem_after // 1024:5} KB  (-{saved}% on disk)")
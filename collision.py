@@ -0,0 +1,322 @@
+import pygame, math
+import numpy as np
+from collections import namedtuple
+from pygame.math import Vector2
+from settings import *
+
+# Collision world. Entities (the player, bosses) register their colliders
+# once per fight in add_colliders(world): hurtboxes (what can be hit) on a
+# layer, hitboxes (what does the hitting) with the layers they hit. Each tick
+# step() calls every owner's update_volumes(), runs one broadphase over a
+# uniform grid of CELL-sized cells and returns the contacts, in registration
+# order, for the game to resolve in a single pass. The hurtboxes are hashed
+# into the cells their bounds touch; each hitbox then looks up only the cells
+# it touches, so a pair that shares no cell never gets the exact
+# (narrowphase) test.
+#
+# A collider is either one damage volume (RectVolume, or ArcVolume for a
+# swung weapon; hurtboxes are always rects) that its owner moves in
+# update_volumes(), or a projectile pool (projectiles.py), whose hits() and
+# struck_by() return masks over its slots. A pool goes into the grid slot by
+# slot, and its narrowphase only runs on the slots the broadphase found. Two
+# pools never test against each other.
+#
+# Tests are swept: everything is checked along the path it moved this tick,
+# not just where it ended up, so a dash or a fast orb cannot step through a
+# hurtbox between two ticks (which would otherwise happen at low tick rates or
+# after a hitch). A swept test always includes the plain end-of-tick overlap.
+
+PLAYER = 1 << 0       # the player's body
+BOSS = 1 << 1         # a boss' body
+PROJECTILES = 1 << 2  # projectiles the player can strike
+
+CELL = 128
+
+Contact = namedtuple("Contact", "hitbox hurtbox slots")  # slots: mask over the pool side, or None
+
+def rect_point_distance(rect: pygame.Rect, point: Vector2) -> float:
+    dx = 0
+    if point.x < rect.left: dx = rect.left - point.x
+    elif point.x > rect.right: dx = point.x - rect.right
+    dy = 0
+    if point.y < rect.top: dy = rect.top - point.y
+    elif point.y > rect.bottom: dy = point.y - rect.bottom
+    return math.hypot(dx, dy)
+
+def segment_crosses_rect(rect: pygame.Rect, a: Vector2, b: Vector2) -> bool:
+    """Whether the segment a-b passes through `rect`, edges included like rect_point_distance."""
+    dx, dy = b.x - a.x, b.y - a.y
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, a.x - rect.left), (dx, rect.right - a.x), (-dy, a.y - rect.top), (dy, rect.bottom - a.y)):
+        if p == 0:
+            if q < 0: return False
+        elif p < 0: t0 = max(t0, q / p)
+        else: t1 = min(t1, q / p)
+    return t0 <= t1
+
+def sector_meets_rect(rect: pygame.Rect, center, inner: float, outer: float, a0: float, a1: float) -> bool:
+    """Whether `rect` meets the ring inner..outer around `center` between angles a0 <= a1 (radians, under a turn apart)."""
+    cx, cy = center
+    span = a1 - a0
+    def in_sector(x, y):
+        return inner <= math.hypot(x - cx, y - cy) <= outer and (math.atan2(y - cy, x - cx) - a0) % math.tau <= span
+    if any(in_sector(x, y) for x, y in (rect.topleft, rect.topright, rect.bottomleft, rect.bottomright)): return True
+    # Otherwise their outlines cross (or the sector lies inside the rect): first the two straight edges...
+    for a in (a0, a1):
+        u = Vector2(math.cos(a), math.sin(a))
+        if segment_crosses_rect(rect, center + u * inner, center + u * outer): return True
+    # ...then the two arcs against each side of the rect
+    for radius in (inner, outer):
+        for x in (rect.left, rect.right):
+            h = radius * radius - (x - cx) ** 2
+            if h < 0: continue
+            for y in (cy - math.sqrt(h), cy + math.sqrt(h)):
+                if rect.top <= y <= rect.bottom and (math.atan2(y - cy, x - cx) - a0) % math.tau <= span: return True
+        for y in (rect.top, rect.bottom):
+            h = radius * radius - (y - cy) ** 2
+            if h < 0: continue
+            for x in (cx - math.sqrt(h), cx + math.sqrt(h)):
+                if rect.left <= x <= rect.right and (math.atan2(y - cy, x - cx) - a0) % math.tau <= span: return True
+    return False
+
+def swept_overlap(a0, a1, b0, b1):
+    """Whether box a (moving a0 -> a1) and box b (b0 -> b1) overlap at any time in the tick."""
+    dx = (a1.x - a0.x) - (b1.x - b0.x)
+    dy = (a1.y - a0.y) - (b1.y - b0.y)
+    enter, leave = -math.inf, math.inf
+    # Along each axis a0, shifted by t*d, overlaps b0 while gap_lo < t*d < gap_hi
+    for gap_lo, gap_hi, d in ((b0.left - a0.right, b0.right - a0.left, dx), (b0.top - a0.bottom, b0.bottom - a0.top, dy)):
+        if d == 0:
+            if not gap_lo < 0 < gap_hi: return False
+            continue
+        t_lo, t_hi = gap_lo / d, gap_hi / d
+        if d < 0: t_lo, t_hi = t_hi, t_lo
+        enter, leave = max(enter, t_lo), min(leave, t_hi)
+    return enter < leave and enter < 1 and leave > 0
+
+# --- Vectorized forms, one result per projectile slot ---
+def rect_points_distance(rect, px, py):
+    """Vectorized rect_point_distance: distance from `rect` to each point (0 inside)."""
+    dx = np.maximum(np.maximum(rect.left - px, px - rect.right), 0)
+    dy = np.maximum(np.maximum(rect.top - py, py - rect.bottom), 0)
+    return np.hypot(dx, dy)
+
+def _axis_times(gap_lo, gap_hi, d):
+    """Open interval of t in which gap_lo < t*d < gap_hi, per element."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_lo, t_hi = gap_lo / d, gap_hi / d
+    still, inside = d == 0, (gap_lo < 0) & (gap_hi > 0)
+    enter = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(t_lo, t_hi))
+    leave = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(t_lo, t_hi))
+    return enter, leave
+
+def swept_overlap_mask(left, top, width, height, dx, dy, b0, b1):
+    """swept_overlap for boxes starting at (left, top) and moving (dx, dy), against one moving Rect."""
+    dx, dy = dx - (b1.x - b0.x), dy - (b1.y - b0.y)
+    enter_x, leave_x = _axis_times(b0.left - (left + width), b0.right - left, dx)
+    enter_y, leave_y = _axis_times(b0.top - (top + height), b0.bottom - top, dy)
+    enter, leave = np.maximum(enter_x, enter_y), np.minimum(leave_x, leave_y)
+    return (enter < leave) & (enter < 1) & (leave > 0)
+
+def points_segment_distance(px, py, ax, ay, bx, by):
+    """Distance from each point (px, py) to its segment (ax, ay)-(bx, by)."""
+    dx, dy = bx - ax, by - ay
+    t = np.clip(((px - ax) * dx + (py - ay) * dy) / np.maximum(dx * dx + dy * dy, 1e-12), 0.0, 1.0)
+    return np.hypot(ax + t * dx - px, ay + t * dy - py)
+
+def segments_rect_distance(rect, ax, ay, bx, by):
+    """Distance from each segment (ax, ay)-(bx, by) to `rect` (0 where they touch)."""
+    dx, dy = bx - ax, by - ay
+    length_sq = np.maximum(dx * dx + dy * dy, 1e-12)
+    distance = np.minimum(rect_points_distance(rect, ax, ay), rect_points_distance(rect, bx, by))
+    sides = []
+    for cx, cy in (rect.topleft, rect.topright, rect.bottomleft, rect.bottomright):
+        t = np.clip(((cx - ax) * dx + (cy - ay) * dy) / length_sq, 0.0, 1.0)
+        distance = np.minimum(distance, np.hypot(ax + t * dx - cx, ay + t * dy - cy))
+        sides.append(dx * (cy - ay) - dy * (cx - ax))
+    # It passes through if its bounding box meets the rect and the corners aren't all on one side of it
+    crosses = ((np.minimum(ax, bx) <= rect.right) & (np.maximum(ax, bx) >= rect.left) &
+               (np.minimum(ay, by) <= rect.bottom) & (np.maximum(ay, by) >= rect.top) &
+               (np.minimum.reduce(sides) <= 0) & (np.maximum.reduce(sides) >= 0))
+    return np.where(crosses, 0.0, distance)
+
+# --- Damage volumes ---
+# Owners keep these current in update_volumes(); `active` switches one off.
+class RectVolume:
+    def __init__(self, rect=None):
+        self.rect = rect
+        self.prev = None  # where `rect` was at the start of the tick; None if it does not move
+        self.active = rect is not None
+        self.box = pygame.Rect(0, 0, 0, 0)
+
+    def start(self):
+        return self.rect if self.prev is None else self.prev
+
+    def bounds(self):
+        if not self.active: return None
+        if self.prev is None: return self.rect
+        self.box.update(self.rect)
+        self.box.union_ip(self.prev)
+        return self.box
+
+    def overlaps(self, other):
+        if self.prev is None and other.prev is None: return self.rect.colliderect(other.rect)
+        return swept_overlap(self.start(), self.rect, other.start(), other.rect)
+
+class ArcVolume:
+    """
+    A circle of `radius` carried round `center` at `reach`, from angle `start`
+    to `end` (degrees, either way round; pygame's y-down angles): everything an
+    axe tip touches in one tick. That is the ring reach-radius..reach+radius
+    between the two angles plus the circle at each end, so it is exact however
+    far the tip turned. Tested against the box the other volume swept this
+    tick (its bounds()), so someone moving into the swing can't slip through.
+    """
+    def __init__(self, reach, radius):
+        self.center = Vector2()
+        self.reach = reach
+        self.radius = radius
+        self.start = self.end = 0.0
+        self.active = False
+        self.box = pygame.Rect(0, 0, 0, 0)
+
+    def tip(self, angle):
+        rad = math.radians(angle)
+        return Vector2(self.center.x + math.cos(rad) * self.reach, self.center.y + math.sin(rad) * self.reach)
+
+    def bounds(self):
+        if not self.active: return None
+        lo, hi = sorted((self.start, self.end))
+        # The ends, plus wherever the arc passes straight left, right, up or down
+        points = [self.tip(lo), self.tip(hi)] + [self.tip(a) for a in range(math.ceil(lo / 90) * 90, math.floor(hi) + 1, 90)]
+        r = self.radius
+        left, top = math.floor(min(p.x for p in points) - r), math.floor(min(p.y for p in points) - r)
+        self.box.update(left, top, math.ceil(max(p.x for p in points) + r) - left, math.ceil(max(p.y for p in points) + r) - top)
+        return self.box
+
+    def overlaps(self, other):
+        rect = other.bounds()
+        if rect_point_distance(rect, self.tip(self.end)) <= self.radius: return True
+        if self.start == self.end: return False
+        if rect_point_distance(rect, self.tip(self.start)) <= self.radius: return True
+        lo, hi = sorted((math.radians(self.start), math.radians(self.end)))
+        return sector_meets_rect(rect, self.center, self.reach - self.radius, self.reach + self.radius, lo, hi)
+
+class Collider:
+    def __init__(self, owner, kind=None, layer=0, hits=0, volume=None, pool=None, spent=False):
+        self.owner = owner
+        self.kind = kind      # what hit the player, for fight_stats
+        self.layer = layer    # hurtboxes: which layer they are on
+        self.hits = hits      # hitboxes: the layers they hit
+        self.volume = volume
+        self.pool = pool
+        self.spent = spent    # pool slots are released once they hit or are struck
+        self.current = None   # this tick's bounds Rect (volumes) or colliding slots (pools)
+
+def touching(a, b):
+    """Whether Rects a and b overlap or share an edge (colliderect leaves out edges, the narrowphase doesn't)."""
+    return a.left <= b.right and b.left <= a.right and a.top <= b.bottom and b.top <= a.bottom
+
+def touching_mask(pool, rect):
+    """Mask of the pool slots whose bounds touch `rect`."""
+    left, top, right, bottom = pool.bounds()
+    return (left <= rect.right) & (right >= rect.left) & (top <= rect.bottom) & (bottom >= rect.top)
+
+def cells(left, top, right, bottom):
+    """The grid cells a box touches, edges included like touching()."""
+    return [(x, y) for x in range(int(left // CELL), int(right // CELL) + 1)
+                   for y in range(int(top // CELL), int(bottom // CELL) + 1)]
+
+def collider_cells(collider):
+    """(slot, cells) for each part of `collider` this tick: the volume (slot None) or each colliding pool slot."""
+    if collider.pool is None:
+        rect = collider.current
+        return [(None, cells(rect.left, rect.top, rect.right, rect.bottom))]
+    slots = np.flatnonzero(collider.current)
+    boxes = [(edge[slots] // CELL).astype(int).tolist() for edge in collider.pool.bounds()]
+    return [(slot, [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)])
+            for slot, x0, y0, x1, y1 in zip(slots.tolist(), *boxes)]
+
+def slot_mask(pool, slots):
+    mask = np.zeros(len(pool.alive), np.bool_)
+    mask[list(slots)] = True
+    return mask
+
+class CollisionWorld:
+    def __init__(self):
+        self.owners = []
+        self.hurtboxes = []
+        self.hitboxes = []
+        self.contacts = []
+        self.grid = {}  # cell -> [(hurtbox index, slot or None)], rebuilt every step
+
+    def clear(self):
+        self.owners.clear()
+        self.hurtboxes.clear()
+        self.hitboxes.clear()
+        self.contacts.clear()
+
+    def add(self, collider, colliders):
+        if collider.owner not in self.owners: self.owners.append(collider.owner)
+        colliders.append(collider)
+        return collider
+
+    def hurtbox(self, owner, layer, volume=None, pool=None, spent=False):
+        return self.add(Collider(owner, layer=layer, volume=volume, pool=pool, spent=spent), self.hurtboxes)
+
+    def hitbox(self, owner, kind, hits, volume=None, pool=None, spent=False):
+        return self.add(Collider(owner, kind, hits=hits, volume=volume, pool=pool, spent=spent), self.hitboxes)
+
+    @staticmethod
+    def update(collider):
+        """Refresh `collider` for this tick; False if it takes no part."""
+        if collider.pool is None:
+            collider.current = collider.volume.bounds()
+            return collider.current is not None
+        if not len(collider.pool): return False
+        collider.current = collider.pool.colliding()
+        return collider.current.any()
+
+    def candidates(self):
+        """{(hitbox index, hurtbox index): (hit slots, hurt slots)} for the pairs sharing a grid cell."""
+        grid = self.grid
+        grid.clear()
+        for j, hurt in enumerate(self.hurtboxes):
+            if not self.update(hurt): continue
+            for slot, keys in collider_cells(hurt):
+                for key in keys: grid.setdefault(key, []).append((j, slot))
+        pairs = {}
+        for i, hit in enumerate(self.hitboxes):
+            if not self.update(hit): continue
+            for slot, keys in collider_cells(hit):
+                for key in keys:
+                    for j, hurt_slot in grid.get(key, ()):
+                        hurt = self.hurtboxes[j]
+                        if not (hit.hits & hurt.layer) or (hit.pool is not None and hurt.pool is not None): continue
+                        hit_slots, hurt_slots = pairs.setdefault((i, j), (set(), set()))
+                        hit_slots.add(slot)
+                        hurt_slots.add(hurt_slot)
+        return pairs
+
+    def step(self):
+        """Broadphase + narrowphase for this tick; returns the list of Contacts."""
+        for owner in self.owners: owner.update_volumes()
+        contacts = self.contacts
+        contacts.clear()
+        pairs = self.candidates()
+        for i, j in sorted(pairs):
+            hit, hurt = self.hitboxes[i], self.hurtboxes[j]
+            hit_slots, hurt_slots = pairs[i, j]
+            if hit.pool is None and hurt.pool is None:
+                if not touching(hit.current, hurt.current): continue
+                if hit.volume.overlaps(hurt.volume): contacts.append(Contact(hit, hurt, None))
+                continue
+            # Sharing a cell only makes them neighbours; the exact bounds still have to touch
+            if hurt.pool is None:
+                near = slot_mask(hit.pool, hit_slots) & touching_mask(hit.pool, hurt.current)
+                if near.any(): near &= hit.pool.hits(hurt)
+            else:
+                near = slot_mask(hurt.pool, hurt_slots) & touching_mask(hurt.pool, hit.current)
+                if near.any(): near &= hurt.pool.struck_by(hit)
+            if near.any(): contacts.append(Contact(hit, hurt, near))
+        return contacts
@@ -0,0 +1,137 @@
+import pygame
+import numpy as np
+from settings import *
+from projectiles import IMPACT, FALLING
+
+# Input is one bitmask of held buttons per tick. Game.step() works out which
+# buttons were just pressed by comparing with the previous tick's mask, so a
+# tick's entire input is a single small int (which is also what replays store).
+#
+# Whatever produces that int is a controller: anything with poll(game) ->
+# buttons, called once per tick. KeyboardController reads the keyboard,
+# BotController plays from the game state without touching pygame at all, and
+# replay.py has ReplayController (plays a recording) and Recorder (records
+# another controller). The Player itself only sees the action-level Actions.
+
+LEFT = 1 << 0
+RIGHT = 1 << 1
+JUMP = 1 << 2
+ATTACK = 1 << 3
+DASH = 1 << 4
+CONFIRM = 1 << 5
+ALL_BUTTONS = (1 << 6) - 1
+
+KEY_BINDINGS = {
+    pygame.K_a: LEFT, pygame.K_LEFT: LEFT,
+    pygame.K_d: RIGHT, pygame.K_RIGHT: RIGHT,
+    pygame.K_w: JUMP,
+    pygame.K_j: ATTACK,
+    pygame.K_k: DASH,
+    pygame.K_SPACE: CONFIRM,
+}
+
+class Actions:
+    """What the player character is asked to do this tick."""
+    __slots__ = ("move", "jump", "attack", "dash")
+
+    def __init__(self, move=0, jump=False, attack=False, dash=False):
+        self.move = move      # -1 left, 0 stand, 1 right
+        self.jump = jump      # held: longer hold, higher jump
+        self.attack = attack
+        self.dash = dash
+
+    @staticmethod
+    def from_buttons(buttons):
+        """The shared (read-only) Actions for a button mask."""
+        return _ACTIONS[buttons & ALL_BUTTONS]
+
+# Every mask's Actions built once, so a tick never allocates one
+_ACTIONS = [Actions(-1 if b & LEFT else 1 if b & RIGHT else 0, bool(b & JUMP), bool(b & ATTACK), bool(b & DASH))
+            for b in range(ALL_BUTTONS + 1)]
+
+def read_keyboard():
+    """Buttons held on the keyboard right now."""
+    keys = pygame.key.get_pressed()
+    buttons = 0
+    for key, button in KEY_BINDINGS.items():
+        if keys[key]: buttons |= button
+    return buttons
+
+class KeyboardController:
+    """Call update(events) once per frame; poll() may run any number of ticks in between."""
+    def __init__(self):
+        self.buttons = 0
+        self.taps = 0  # pressed this frame and not yet seen by a tick
+
+    def update(self, events):
+        self.buttons = read_keyboard()
+        # A tap shorter than a frame is already released by the time we look,
+        # and a frame may run no tick at all; either way the next tick sees it
+        for event in events:
+            if event.type == pygame.KEYDOWN: self.taps |= KEY_BINDINGS.get(event.key, 0)
+
+    def poll(self, game):
+        buttons = self.buttons | self.taps
+        self.taps = 0
+        return buttons
+
+class BotController:
+    """
+    Scripted player for simulations. Presses CONFIRM through menus and
+    dialogue; in fights it closes in and attacks, swats orbs, steps out from
+    under meteors, parries Harus' swings, runs from his spin and jumps
+    shockwaves. `skill` is the chance it reacts to any one threat; the rolls
+    come from `rng` (the game's "bot" stream) so a seed always plays the same.
+    """
+    def __init__(self, rng, skill=0.75):
+        self.rng = rng
+        self.skill = skill
+        self.rolls = {}  # threat (kind, id) -> whether the bot reacts to it
+
+    def reacts(self, threat):
+        if threat not in self.rolls: self.rolls[threat] = self.rng.random() < self.skill
+        return self.rolls[threat]
+
+    def poll(self, game):
+        if game.state in (STATE_MENU, STATE_DIALOGUE, STATE_GAMEOVER, STATE_ENDING):
+            return 0 if game.buttons & CONFIRM else CONFIRM  # tap, release, tap...
+
+        player, boss = game.player, game.boss
+        if not boss: return 0
+        x = player.pos.x
+        dx = boss.pos.x - x
+        toward = RIGHT if dx > 0 else LEFT
+        away = LEFT if dx > 0 else RIGHT
+        buttons = toward if abs(dx) > 90 else 0
+
+        if game.state == STATE_GAME_PAPIA:
+            m = boss.meteors
+            if len(m):
+                coming = (m.state != IMPACT) & (np.abs(m.x - x) < m.RADIUS + 25) & ((m.state == FALLING) | (m.windup < 0.4))
+                for i in m.oldest_first(coming):
+                    # Step to whichever side is further from the strike
+                    if self.reacts(("meteor", m.id[i])): return (LEFT if m.x[i] > x else RIGHT) | DASH
+            o = boss.orbs
+            if len(o):
+                for i in o.oldest_first(o.launched & o.near_mask(player.pos, 110)):
+                    if self.reacts(("orb", o.id[i])): return (RIGHT if o.x[i] > x else LEFT) | ATTACK
+            if abs(dx) < 130: buttons |= ATTACK
+            return buttons
+
+        # Harus
+        s = boss.shockwaves
+        if len(s):
+            ahead = (x - (s.x + s.W / 2)) * s.direction
+            for i in s.oldest_first((ahead > 0) & (ahead < 160)):
+                if self.reacts(("shockwave", s.id[i])): buttons |= JUMP
+        attacking = boss.state in ("telegraph", "parry", "active")
+        threat = (boss.attacks, boss.attack_type)
+        if attacking and boss.attack_type == "spin" and self.reacts(threat):
+            # The spin covers 200px either side; get clear and stay clear
+            if abs(dx) < 230: return away | (DASH if boss.state == "telegraph" else 0) | (buttons & JUMP)
+            return buttons & JUMP
+        # A hit only parries once the swing is live, so time the windup to land just after it starts
+        parry = boss.state == "parry" and boss.timer < 0.05 and abs(dx) < 150 and self.reacts(threat)
+        if parry or boss.state in ("stunned", "recovery"):
+            buttons |= ATTACK
+        return buttons
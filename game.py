@@ -0,0 +1,448 @@
+import pygame, os, random, zlib
+from time import perf_counter
+from settings import *
+from controls import *
+from player import Player
+from bosses import PapiaBoss, HarusBoss
+from collision import CollisionWorld, PLAYER
+from story import CutsceneManager, DialogueSystem
+from atlas import load_atlas
+from prefetch import prefetch, wait_for
+from sprites import evict_scene
+from render import mark
+from audio import sounds, MIXER_FREQUENCY, MIXER_SIZE, MIXER_OUTPUT_CHANNELS
+
+# The whole game as an object: step(dt, buttons) advances the state machine
+# (menu -> Papia -> Harus -> ending), render(surface) draws the current state.
+# Neither touches the window or the event queue, so the game can be driven
+# without a display, e.g.
+#
+#     screen = init_pygame(headless=True)
+#     game = Game()
+#     bot = BotController(game.rng["bot"])
+#     for tick in range(10000): game.step(1 / TICK_RATE, bot.poll(game))
+#
+# The simulation always steps at TICK_RATE; FixedTimestep turns the frame
+# times of the real loop into whole ticks and render() interpolates between
+# the last two, so physics and timing windows never depend on frame rate.
+# main.py presents frames through render.Renderer, which redraws only what
+# changed over the static background(). On screens that only change on input
+# or a timer (idle_view()) it skips drawing altogether and sleeps in
+# pygame.event.wait until one of those happens.
+
+def init_pygame(headless=False):
+    """Open the window (or a dummy one) and the mixer. Returns the screen surface.
+
+    headless uses SDL's dummy video driver and leaves the mixer closed, so
+    every sound loads as None and nothing is played.
+    """
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        pygame.display.init()
+        pygame.font.init()
+    else:
+        pygame.mixer.pre_init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_OUTPUT_CHANNELS)
+        pygame.init()
+        pygame.mixer.init()
+        sounds.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Vanitas")
+    return screen
+
+def load_img(path, scale=None):
+    try:
+        img = load_image(path)
+        if scale:
+            img = pygame.transform.scale(img, scale)
+        return img
+    except Exception as e:
+        print(f"Missing Asset: {path}")
+        s = pygame.Surface((scale if scale else (100,100)))
+        s.fill((50, 0, 0))
+        return s
+
+class FixedTimestep:
+    """Accumulates frame time and hands it out as fixed-size ticks."""
+    def __init__(self, rate=TICK_RATE, max_frame=0.25):
+        self.dt = 1.0 / rate
+        self.max_frame = max_frame  # a longer stall is dropped, not caught up on
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        """Add a frame's worth of time; returns how many ticks to step."""
+        self.accumulator += min(frame_dt, self.max_frame)
+        # The epsilon keeps 1/60 s from coming out as 1.999... ticks of 1/120 s
+        ticks = int(self.accumulator / self.dt + 1e-6)
+        self.accumulator = max(0.0, self.accumulator - ticks * self.dt)
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far between the previous and the latest tick to draw, 0..1."""
+        return min(1.0, self.accumulator / self.dt)
+
+class RandomStreams:
+    """
+    One seeded Random per subsystem ("papia", "harus", "shake"), so extra
+    rolls in one of them (the shake runs per rendered frame) never shift
+    the others. The same seed and inputs always replay the same fight.
+    """
+    def __init__(self, seed):
+        self.seed = seed
+        self.streams = {}
+
+    def __getitem__(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = self.streams[name] = random.Random(f"{self.seed}:{name}")
+        return stream
+
+MENU_BLINK = 0.5  # seconds the menu prompt stays shown, then hidden
+IDLE_STATES = (STATE_MENU, STATE_GAMEOVER, STATE_DIALOGUE)
+
+class Game:
+    def __init__(self, seed=None):
+        # --- FONTS ---
+        try:
+            font_path = "assets/font.ttf"
+            self.font_ui = pygame.font.Font(font_path, 20)
+            self.font_big = pygame.font.Font(font_path, 56)
+        except:
+            self.font_ui = pygame.font.SysFont("georgia", 20)
+            self.font_big = pygame.font.SysFont("times new roman", 60, bold=True)
+
+        # --- LOAD ASSETS ---
+        # Sprite strips come from the packed atlas when it has been built (python atlas.py)
+        load_atlas()
+
+        # UI Assets
+        self.wife_portrait = load_img("assets/story/wife.png", (100, 100))
+
+        # Game Assets
+        self.img_bg_fight = load_img("assets/story/bg1.png", (WIDTH, HEIGHT))
+
+        # Story Assets
+        self.img_title = load_img("assets/story/title.png", (WIDTH, HEIGHT))
+        self.img_marriage = load_img("assets/story/marriage.png")
+        self.img_hand1 = load_img("assets/story/hand1.png")
+        self.img_hand2 = load_img("assets/story/hand2.png")
+        self.img_cave = load_img("assets/story/cave.png")
+        self.img_cave_full = pygame.transform.scale(self.img_cave, (WIDTH, HEIGHT))  # behind the first dialogue
+        self.img_end = load_img("assets/story/end.png")
+
+        # Backgrounds of the screens without an image
+        self.bg_black = pygame.Surface((WIDTH, HEIGHT))
+        self.bg_black.fill(BLACK)
+        self.bg_dialogue = pygame.Surface((WIDTH, HEIGHT))
+        self.bg_dialogue.fill((15, 15, 20))
+
+        # --- GAME VARIABLES ---
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = RandomStreams(self.seed)
+        self.state = STATE_MENU
+        self.player = Player()
+        self.boss = None
+        self.world = CollisionWorld()
+        self.base_memory_opacity = 255
+        self.checkpoint_reached = False
+        self.time = 0.0      # seconds of game time stepped so far
+        self.ticks = 0
+        self.buttons = 0     # last tick's input, to tell presses from holds
+
+        # Story Systems
+        self.cutscene_mgr = CutsceneManager()
+        self.dialogue_sys = DialogueSystem()
+
+        # Screen Shake
+        self.shake_timer = 0.0
+        self.shake_intensity = 0.0
+
+        self.fight_stats = self.new_fight_stats()
+        self.timings = None  # a timings.FrameTimings while the F3 overlay is on
+
+    def reseed(self, seed):
+        self.seed = seed
+        self.rng = RandomStreams(seed)
+
+    @staticmethod
+    def new_fight_stats():
+        return {"damage_taken": {}, "parries": 0}  # damage_taken: attack name -> hits
+
+    def start_shake(self, intensity, duration=0.2):
+        self.shake_timer = duration
+        self.shake_intensity = intensity
+
+    def start_fight(self, boss):
+        """Make `boss` the opponent and register both fighters' colliders."""
+        self.boss = boss
+        self.fight_stats = self.new_fight_stats()
+        self.world.clear()
+        self.player.add_colliders(self.world)
+        boss.add_colliders(self.world)
+
+    def reset(self):
+        self.state = STATE_MENU
+        self.player = Player()
+        self.base_memory_opacity = 255
+        self.checkpoint_reached = False
+
+    # --- STORY FLOW ---
+
+    def start_intro_cutscene(self):
+        self.state = STATE_CUTSCENE
+        prefetch("papia", PapiaBoss.preload)
+        self.cutscene_mgr.start_sequence([
+            {"image": self.img_marriage, "text": "She was my beloved", "duration": 3.0},
+            {"image": self.img_hand1, "text": "But they...", "duration": 2.0},
+            {"image": self.img_hand2, "text": "They took her from me", "duration": 2.5},
+            {"image": self.img_cave, "text": "I finally tracked them, I must take my revenge", "duration": 3.0},
+        ])
+
+    def finish_intro_cutscene(self):
+        self.state = STATE_DIALOGUE
+        self.dialogue_sys.start_dialogue(
+            "To enter, you must shed the weight of your past.\nForget your FIRST DATE to gain speed?    ",
+            self.unlock_dash_and_start,
+            refusal_text="I won't turn back, I must seek revenge"
+        )
+
+    def unlock_dash_and_start(self):
+        self.player.can_dash = True
+        self.base_memory_opacity = 190
+        self.state = STATE_GAME_PAPIA
+        wait_for("papia")
+        self.start_fight(PapiaBoss(self.rng["papia"]))
+        self.player.place((100, GROUND_Y))
+
+    def start_transition_dialogue(self):
+        self.state = STATE_DIALOGUE
+        prefetch("harus", HarusBoss.preload)
+        self.dialogue_sys.start_dialogue(
+            "Papia falls, but the killer remains.\nForget her VOICE to gain strength?    ",
+            self.unlock_checkpoint_and_start,
+            refusal_text="I'm so close, I won't turn back"
+        )
+
+    def unlock_checkpoint_and_start(self):
+        self.base_memory_opacity = 100
+        self.state = STATE_GAME_HARUS
+        wait_for("harus")
+        evict_scene("papia")
+        self.start_fight(HarusBoss(self.rng["harus"]))
+        self.player.place((100, GROUND_Y))
+        self.player.hp = self.player.max_hp
+        self.checkpoint_reached = True
+
+    def start_ending_sequence(self):
+        self.state = STATE_ENDING
+        self.base_memory_opacity = 0
+        evict_scene("harus")
+        self.cutscene_mgr.start_sequence([
+            {"image": self.img_end, "text": "My revenge is complete, yet I cannot remember her name", "duration": 999}
+        ])
+
+    # --- SIMULATION ---
+
+    def step(self, dt, buttons):
+        """Advance the game by dt seconds with `buttons` (controls.py bitmask) held."""
+        pressed = buttons & ~self.buttons
+        self.buttons = buttons
+        self.time += dt
+        self.ticks += 1
+
+        if self.state == STATE_DIALOGUE:
+            self.dialogue_sys.handle_input(pressed)
+
+        elif pressed & CONFIRM:
+            if self.state == STATE_MENU:
+                self.start_intro_cutscene()
+
+            elif self.state == STATE_ENDING:
+                self.reset()
+
+            elif self.state == STATE_GAMEOVER:
+                if self.checkpoint_reached:
+                    self.start_transition_dialogue()
+                    self.player = Player()
+                    self.player.can_dash = True
+                else:
+                    self.reset()
+
+        # Logic
+        if self.state in [STATE_CUTSCENE, STATE_ENDING]:
+            self.cutscene_mgr.update(dt)
+            if self.state == STATE_CUTSCENE and self.cutscene_mgr.finished:
+                self.finish_intro_cutscene()
+
+        elif self.state in [STATE_GAME_PAPIA, STATE_GAME_HARUS]:
+            self.update_fight(dt, buttons)
+
+        if self.shake_timer > 0:
+            self.shake_timer -= dt
+
+    def update_fight(self, dt, buttons):
+        player, boss, timings = self.player, self.boss, self.timings
+        since = timings and perf_counter()
+        player.update(dt, Actions.from_buttons(buttons))
+        if timings: since = timings.lap("player", since)
+        if not boss: return
+
+        boss.update(dt, player)
+        if timings: since = timings.lap("boss", since)
+        if boss.shake_requested > 0:
+            self.start_shake(boss.shake_requested)
+
+        # Interactions: resolve this tick's contacts in order (the player's sword
+        # first). boss_hit names the last attack that reached the player, for fight_stats
+        boss_hit = None
+        for hit, hurt, slots in self.world.step():
+            if slots is not None:
+                pool = hurt.pool if hurt.pool is not None else hit.pool
+                slots = slots & pool.alive
+                if not slots.any(): continue  # already struck down this tick
+                if hurt.spent or hit.spent: pool.release(slots)
+            elif not hit.volume.active: continue  # switched off by a parry this tick
+
+            if hurt.layer & PLAYER:
+                boss_hit = hit.kind
+            elif slots is not None:
+                hurt.owner.hp -= int(slots.sum())
+                player.attack_damage_applied = True
+            elif not player.attack_damage_applied:
+                target = hurt.owner
+                target.hp -= 1
+                player.attack_damage_applied = True
+                if target.parry_window:
+                    target.on_parried()
+                    self.fight_stats["parries"] += 1
+
+        if boss_hit and player.hit_recovery_timer <= 0:
+            damage = self.fight_stats["damage_taken"]
+            damage[boss_hit] = damage.get(boss_hit, 0) + 1
+            player.hp -= 1
+            player.hit_recovery_timer = 1.0
+            player.vel.x = -300 * player.facing
+            self.start_shake(5, 0.2)
+        if timings: timings.lap("collision", since)
+
+        if player.hp <= 0:
+            boss.cleanup()
+            self.boss = None
+            self.state = STATE_GAMEOVER
+
+        elif boss.hp <= 0:
+            boss.cleanup()
+            self.boss = None
+            if self.state == STATE_GAME_PAPIA:
+                self.start_transition_dialogue()
+            else:
+                self.start_ending_sequence()
+
+    def checksum(self):
+        """CRC of the simulation state, to check a replay ends where its recording did."""
+        boss = self.boss
+        state = (self.state, self.ticks, self.player.hp, tuple(self.player.pos),
+                 boss and boss.hp, boss and tuple(boss.pos))
+        return zlib.crc32(repr(state).encode())
+
+    # --- DRAWING ---
+
+    def draw_ui(self, screen, player, boss_name, boss_hp, boss_max):
+        # Health Bar
+        mark(screen, pygame.draw.rect(screen, RED, (20, 20, player.hp * 20, 20)))
+        mark(screen, pygame.draw.rect(screen, WHITE, (20, 20, player.max_hp * 20, 20), 2))
+
+        # Boss Health Bar
+        if boss_hp > 0:
+            bar_w = 300
+            ratio = boss_hp / boss_max
+            mark(screen, pygame.draw.rect(screen, PURPLE, (WIDTH - 320, 20, bar_w * ratio, 20)))
+            mark(screen, pygame.draw.rect(screen, WHITE, (WIDTH - 320, 20, bar_w, 20), 2))
+            txt = render_text(self.font_ui, boss_name, WHITE)
+            screen.blit(txt, (WIDTH - 320, 45))
+
+        # --- WIFE PORTRAIT LOGIC ---
+        # Draw Frame
+        frame_rect = pygame.Rect(18, 58, 104, 104)
+        mark(screen, pygame.draw.rect(screen, (220, 220, 220), frame_rect, 3))
+
+        # Calculate Opacity
+        current_alpha = self.base_memory_opacity
+        if self.boss and boss_max > 0:
+            hp_percent = max(0, boss_hp / boss_max)
+            if boss_name == "PAPIA":
+                current_alpha = 100 + int((190 - 100) * hp_percent)
+            elif "HARUS" in boss_name:
+                current_alpha = int(100 * hp_percent)
+
+        # Draw Photo
+        if current_alpha > 0:
+            self.wife_portrait.set_alpha(current_alpha)
+            screen.blit(self.wife_portrait, (20, 60))
+
+    def draw_text_centered(self, screen, text, y_offset=0, color=WHITE, font=None):
+        surf = render_text(font or self.font_big, text, color)
+        rect = surf.get_rect(center=(WIDTH//2, HEIGHT//2 + y_offset))
+        screen.blit(surf, rect)
+
+    def background(self):
+        """(key, surface) of the static layer behind the current screen; the key changes whenever the surface does."""
+        if self.state == STATE_MENU: return "title", self.img_title
+        if self.state in [STATE_CUTSCENE, STATE_ENDING]: return self.cutscene_mgr.background()
+        if self.state == STATE_DIALOGUE:
+            if self.img_cave and "FIRST DATE" in self.dialogue_sys.text:
+                return "cave", self.img_cave_full
+            return "dialogue", self.bg_dialogue
+        if self.state in [STATE_GAME_PAPIA, STATE_GAME_HARUS]: return "fight", self.img_bg_fight
+        return "black", self.bg_black
+
+    def idle_view(self):
+        """On a static screen, (what it shows, seconds until that changes by itself or None);
+        None while anything animates. Equal views draw identical frames."""
+        if self.state not in IDLE_STATES or self.shake_timer > 0: return None
+        if self.state == STATE_MENU:
+            return (self.state, int(self.time / MENU_BLINK) % 2), MENU_BLINK - self.time % MENU_BLINK
+        if self.state == STATE_DIALOGUE:
+            return (self.state, self.dialogue_sys.text, self.dialogue_sys.selected_index), None
+        return (self.state,), None
+
+    def needs_full_redraw(self):
+        """Shake moves the background and a fade covers the whole screen."""
+        return self.shake_timer > 0 or (self.state in [STATE_CUTSCENE, STATE_ENDING] and self.cutscene_mgr.fade_alpha > 0)
+
+    def render(self, screen, alpha=1.0, background=True):
+        """Draw the state `alpha` of the way from the previous tick to the latest;
+        background=False draws only what goes over background()."""
+        offset = (0, 0)
+        if self.shake_timer > 0:
+            shake = self.rng["shake"]
+            offset = (shake.randint(-int(self.shake_intensity), int(self.shake_intensity)),
+                      shake.randint(-int(self.shake_intensity), int(self.shake_intensity)))
+
+        if background:
+            screen.fill(BLACK)
+            screen.blit(self.background()[1], offset)
+
+        if self.state == STATE_MENU:
+            if int(self.time / MENU_BLINK) % 2 == 0:
+                surf = render_text(self.font_ui, "Press SPACE to Start", GRAY)
+                screen.blit(surf, surf.get_rect(center=(WIDTH//2, HEIGHT - 80)))
+
+        elif self.state in [STATE_CUTSCENE, STATE_ENDING]:
+            self.cutscene_mgr.draw(screen)
+
+        elif self.state == STATE_DIALOGUE:
+            self.dialogue_sys.draw(screen)
+
+        elif self.state in [STATE_GAME_PAPIA, STATE_GAME_HARUS]:
+            if self.boss: self.boss.draw(screen, offset, alpha)
+            self.player.draw(screen, offset, alpha)
+
+            boss_name = "PAPIA" if self.state == STATE_GAME_PAPIA else "HARUS"
+            if self.boss: self.draw_ui(screen, self.player, boss_name, self.boss.hp, self.boss.max_hp)
+
+        elif self.state == STATE_GAMEOVER:
+            self.draw_text_centered(screen, "DEATH", -20, RED)
+            msg = "(press space to retry)"
+            surf = render_text(self.font_ui, msg, WHITE)
+            screen.blit(surf, surf.get_rect(center=(WIDTH//2, HEIGHT//2 + 40)))
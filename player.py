@@ -1,10 +1,28 @@
 import pygame
 from pygame.math import Vector2
 from settings import *
+from sprites import AnimationBank, load_bank, load_strips
+from audio import sounds
+from collision import PLAYER, BOSS, PROJECTILES, RectVolume
 
 class Player:
+    # state -> (strip path, frame count, frame w, frame h, seconds per frame)
+    ANIMATIONS = {
+        "idle": ("assets/protag/idle.png", 4, None, None, 0.25),
+        "walk": ("assets/protag/walk.png", 2, None, None, 0.15),
+        "windup": ("assets/protag/windup.png", 2, None, None, 0.10),
+        "attack": ("assets/protag/attack.png", 1, None, None, 0.20),
+        "recovery": ("assets/protag/recovery.png", 1, None, None, 0.20),
+        "dash": ("assets/protag/dash.png", 1, None, None, 0.10),
+    }
+    SFX = {  # name: (path, volume, max_voices)
+        "dash": ("assets/SFX/DASH.wav", None, 1),
+        "slash": ("assets/SFX/SWORD SLASH.wav", 0.6, 2),
+    }
+
     def __init__(self):
         self.pos = Vector2(220, GROUND_Y)
+        self.prev_pos = Vector2(self.pos)  # position one tick ago, for render interpolation
         self.vel = Vector2(0,0)
         self.facing = 1
         self.on_ground = True
@@ -19,6 +37,11 @@ class Player:
         self.attack_timer = 0
         self.attack_hitbox = None
         self.attack_damage_applied = False
+        self.hurt_rect = pygame.Rect(0, 0, 40, 80)
+        self.body = RectVolume(self.hurt_rect)
+        self.body.prev = pygame.Rect(self.hurt_rect)  # hit tests sweep from where the player was
+        self.sword = RectVolume()
+        self.sword.prev = pygame.Rect(0, 0, 0, 0)
         self.cooldown = 0
         
         self.hit_recovery_timer = 0
@@ -33,30 +56,43 @@ class Player:
         self.dash_cooldown_time = 0.6
 
         # Animations
-        self.animations = {
-            "idle": load_strip("assets/protag/idle.png", 4),
-            "walk": load_strip("assets/protag/walk.png", 2),
-            "windup": load_strip("assets/protag/windup.png", 2),
-            "attack": load_strip("assets/protag/attack.png", 1),
-            "recovery": load_strip("assets/protag/recovery.png", 1),
-            "dash": load_strip("assets/protag/dash.png", 1)
-        }
+        self.bank = load_bank("player", self.build_bank, "player")
         self.anim_state = "idle"
         self.anim_frame = 0
         self.anim_timer = 0
-        self.anim_speed = {"idle": 0.25, "walk": 0.15, "windup": 0.10, "attack": 0.20, "recovery": 0.20, "dash": 0.1}
 
         # SFX
-        try:
-            self.sfx_dash = pygame.mixer.Sound("assets/SFX/DASH.wav")
-            self.sfx_slash = pygame.mixer.Sound("assets/SFX/SWORD SLASH.wav")
-            self.sfx_slash.set_volume(0.6)
-        except:
-            self.sfx_dash = None
-            self.sfx_slash = None
+        self.sfx_dash = sounds.load(*self.SFX["dash"])
+        self.sfx_slash = sounds.load(*self.SFX["slash"])
+
+    @classmethod
+    def build_bank(cls):
+        animations, durations = load_strips(cls.ANIMATIONS, scene="player")
+        return AnimationBank(animations, 2.0, durations)
 
     def hurtbox(self):
-        return pygame.Rect(self.pos.x-20, self.pos.y-80, 40, 80)
+        self.hurt_rect.update(self.pos.x-20, self.pos.y-80, 40, 80)
+        return self.hurt_rect
+
+    def add_colliders(self, world):
+        world.hurtbox(self, PLAYER, self.body)
+        world.hitbox(self, "sword", BOSS | PROJECTILES, self.sword)
+
+    def place(self, pos):
+        """Put the player at `pos` outright: nothing interpolates or sweeps from where it was."""
+        self.pos.update(pos)
+        self.prev_pos.update(pos)
+        self.update_volumes()
+
+    def update_volumes(self):
+        body, sword = self.body, self.sword
+        self.hurtbox()
+        body.prev.update(self.prev_pos.x-20, self.prev_pos.y-80, 40, 80)
+        sword.rect = self.attack_hitbox
+        sword.active = self.attack_state == "active" and self.attack_hitbox is not None
+        if sword.active:  # the sword moves with the body
+            sword.prev.update(sword.rect)
+            sword.prev.move_ip(body.prev.x - body.rect.x, body.prev.y - body.rect.y)
 
     def start_attack(self):
         if self.attack_state != "ready" or self.is_dashing:
@@ -81,7 +117,9 @@ class Player:
         self.hit_recovery_timer = self.dash_time
         if self.sfx_dash: self.sfx_dash.play()
 
-    def update(self, dt, keys):
+    def update(self, dt, actions):
+        """actions = controls.Actions for this tick"""
+        self.prev_pos.update(self.pos)
         if self.hit_recovery_timer > 0: self.hit_recovery_timer -= dt
         if self.dash_cooldown > 0: self.dash_cooldown -= dt
         if self.cooldown > 0: self.cooldown -= dt
@@ -91,27 +129,27 @@ class Player:
         can_move = self.attack_state in ("ready", "recovery") and not self.is_dashing
 
         if can_move:
-            if keys[pygame.K_a]:
+            if actions.move < 0:
                 self.facing = -1
                 self.vel.x = -200
-            elif keys[pygame.K_d]:
+            elif actions.move > 0:
                 self.facing = 1
                 self.vel.x = 200
             else:
                 self.vel.x = 0
 
-            if keys[pygame.K_w] and self.on_ground:
+            if actions.jump and self.on_ground:
                 self.vel.y = -300
                 self.jump_hold = 0.3
                 self.on_ground = False
-            if not keys[pygame.K_w]:
+            if not actions.jump:
                 self.jump_hold = 0
             if self.jump_hold > 0:
                 self.vel.y -= 900 * dt
                 self.jump_hold -= dt
 
-            if keys[pygame.K_j]: self.start_attack()
-            if keys[pygame.K_k]: self.start_dash()
+            if actions.attack: self.start_attack()
+            if actions.dash: self.start_dash()
         else:
             if not self.is_dashing:
                 self.vel.x = 0
@@ -176,26 +214,21 @@ class Player:
             self.anim_timer = 0
             
         self.anim_timer += dt
-        if self.anim_timer >= self.anim_speed.get(state, 0.2):
+        if self.anim_timer >= self.bank.duration(state, self.anim_frame):
             self.anim_timer = 0
-            self.anim_frame = (self.anim_frame + 1) % len(self.animations[self.anim_state])
+            self.anim_frame = (self.anim_frame + 1) % self.bank.frame_count(self.anim_state)
 
-    def draw(self, screen, offset=(0,0)):
+    def draw(self, screen, offset=(0,0), alpha=1.0):
         if self.hit_recovery_timer > 0 and not self.is_dashing:
             if int(self.hit_recovery_timer * 10) % 2 == 0:
                 return
 
-        frames = self.animations.get(self.anim_state)
-        if not frames: return
-        
-        frame = frames[self.anim_frame] if self.anim_frame < len(frames) else frames[0]
-        SCALE = 2.0
-        
-        if self.facing == -1:
-            frame = pygame.transform.flip(frame, True, False)
-            
-        frame = pygame.transform.scale(frame, (int(frame.get_width()*SCALE), int(frame.get_height()*SCALE)))
+        frames = self.bank.frames(self.anim_state, self.facing)
+        index = self.anim_frame if self.anim_frame < len(frames) else 0
+        frame = frames[index]
         
-        draw_x = self.pos.x - frame.get_width() // 2 + offset[0]
-        draw_y = self.pos.y - frame.get_height() + offset[1]
-        screen.blit(frame, (draw_x, draw_y))
\ No newline at end of file
+        pos = self.prev_pos.lerp(self.pos, alpha)
+        draw_x = pos.x - frame.get_width() // 2 + offset[0]
+        draw_y = pos.y - frame.get_height() + offset[1]
+        trim = self.bank.trim(self.anim_state, index, self.facing)
+        screen.blit(frame, (draw_x + trim.x, draw_y + trim.y), trim)
\ No newline at end of file
@@ -0,0 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Background asset loading. Each job warms the shared caches (strips, imported
+# animations, sounds) for an upcoming scene while dialogue is on screen, so
+# constructing the boss afterwards is all cache hits.
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+_jobs = {}  # name -> Future
+
+def prefetch(name, loader):
+    """Start loader() in the background unless it is already running. Returns its Future."""
+    job = _jobs.get(name)
+    if job is None or job.done():
+        job = _jobs[name] = _executor.submit(loader)
+    return job
+
+def wait_for(name):
+    """Block until the named job has finished; returns at once if it already has."""
+    job = _jobs.pop(name, None)
+    if job is None: return
+    try:
+        job.result()
+    except Exception as e:
+        # The constructor will load whatever is still missing itself
+        print(f"Prefetch Warning: {name}: {e}")
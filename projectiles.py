@@ -0,0 +1,367 @@
+import pygame, math
+import numpy as np
+from abc import ABC, abstractmethod
+from settings import *
+from render import mark
+from collision import rect_points_distance, points_segment_distance, segments_rect_distance, swept_overlap_mask
+
+# Structure-of-arrays projectile pools. Each kind keeps one NumPy array per
+# field, allocated up front at CAPACITY; a slot is taken with activate() and
+# handed back with release(), and `alive` marks the slots in use. A full pool
+# doubles its arrays rather than drop a spawn, so CAPACITY only needs to cover
+# a normal fight, which then never allocates a projectile. update() and the hit
+# tests are a handful of array operations (masked by `alive`) however many are
+# in flight.
+# Only draw() still loops, over live(), since every projectile is its own blit.
+# Updates use ufuncs with where= rather than boolean indexing: with a few
+# dozen projectiles the per-call overhead is most of the cost.
+
+class Projectiles(ABC):
+    """Base pool; subclasses list their FIELDS as (name, dtype)."""
+    FIELDS = ()
+    CAPACITY = 16
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or self.CAPACITY
+        self.next_id = 0
+        self.fields = [("id", np.uint32)] + list(self.FIELDS)
+        for name, dtype in self.fields:
+            setattr(self, name, np.zeros(self.capacity, dtype))
+        self.alive = np.zeros(self.capacity, np.bool_)
+        self.free = list(range(self.capacity - 1, -1, -1))  # stack of free slots, lowest on top
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def grow(self):
+        """Double the capacity, keeping every slot where it is."""
+        old, self.capacity = self.capacity, self.capacity * 2
+        for name, dtype in self.fields:
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(old, dtype)]))
+        self.alive = np.concatenate([self.alive, np.zeros(old, np.bool_)])
+        self.free.extend(range(self.capacity - 1, old - 1, -1))  # only called when full, so just the new slots
+
+    def activate(self, **values):
+        """Take a free slot, growing the pool if it is full; fields not given start at 0. Returns the slot."""
+        if not self.free: self.grow()
+        i = self.free.pop()
+        for name, _ in self.fields:
+            getattr(self, name)[i] = values.get(name, 0)
+        self.id[i] = self.next_id
+        self.next_id += 1
+        self.alive[i] = True
+        return i
+
+    def release(self, mask):
+        """Free every live slot where `mask` is True."""
+        for i in np.flatnonzero(mask & self.alive):
+            self.alive[i] = False
+            self.free.append(int(i))
+
+    def live(self):
+        """Indices of the slots in use, lowest first."""
+        return np.flatnonzero(self.alive)
+
+    # Collision protocol (collision.py): masks over the slots touching a collider
+    # at any point this tick, i.e. swept from where both were at its start
+    def colliding(self):
+        """Slots that can hit or be hit this tick."""
+        return self.alive
+
+    @abstractmethod
+    def bounds(self):
+        """Per-slot (left, top, right, bottom) arrays the broadphase files each slot under."""
+
+    @abstractmethod
+    def hits(self, hurtbox):
+        """Slots that hit `hurtbox` this tick."""
+
+    def struck_by(self, hitbox):
+        """Only pools registered as hurtboxes can be struck; the rest never are."""
+        return np.zeros(self.capacity, np.bool_)
+
+    def oldest_first(self, mask):
+        """Indices of the live slots where `mask` is True, in spawn order."""
+        slots = np.flatnonzero(mask & self.alive)
+        return slots[np.argsort(self.id[slots])] if len(slots) > 1 else slots
+
+    def clear(self):
+        self.release(self.alive)
+
+# --- Papia's meteors ---
+WAITING, FALLING, IMPACT = 0, 1, 2
+
+class Meteors(Projectiles):
+    FIELDS = [
+        ("x", np.float64), ("y", np.float64), ("prev_y", np.float64),
+        ("windup", np.float64),        # telegraph time left while WAITING
+        ("impact_timer", np.float64),  # explosion time left while IMPACT
+        ("frame", np.float64),         # animation position while FALLING
+        ("state", np.uint8),
+    ]
+    CAPACITY = 32  # a shower uses at most every other grid column
+    START_Y = -80
+    TARGET_Y = GROUND_Y - 6
+    RADIUS = 26
+    FALL_SPEED = 700.0
+    ANIM_SPEED = 12.0
+    IMPACT_TIME = 0.30
+
+    def __init__(self, frames, capacity=None):
+        super().__init__(capacity)
+        self.frames = frames
+
+    def spawn(self, x, delay=1.1):
+        return self.activate(x=x, y=self.START_Y, prev_y=self.START_Y, windup=delay, state=WAITING)
+
+    def update(self, dt):
+        """Advance every meteor; returns how many hit the ground this tick."""
+        if len(self) == 0: return 0
+        alive, y, state, windup, timer = self.alive, self.y, self.state, self.windup, self.impact_timer
+        self.prev_y[:] = y
+        waiting, falling, impact = alive & (state == WAITING), alive & (state == FALLING), alive & (state == IMPACT)
+
+        exploding = np.count_nonzero(impact)
+        if exploding: np.subtract(timer, dt, out=timer, where=impact)
+        if np.count_nonzero(waiting):
+            np.subtract(windup, dt, out=windup, where=waiting)
+            np.copyto(state, FALLING, where=waiting & (windup <= 0))
+
+        count = 0
+        if np.count_nonzero(falling):
+            np.add(self.frame, self.ANIM_SPEED * dt, out=self.frame, where=falling)
+            np.add(y, self.FALL_SPEED * dt, out=y, where=falling)
+            landed = falling & (y >= self.TARGET_Y)
+            count = np.count_nonzero(landed)
+            if count:
+                np.copyto(y, self.TARGET_Y, where=landed)
+                np.copyto(state, IMPACT, where=landed)
+                np.copyto(timer, self.IMPACT_TIME, where=landed)
+
+        if exploding: self.release(impact & (timer <= 0))
+        return count
+
+    def hit_mask(self, hurtbox, start=None):
+        """Which meteors touch `hurtbox` (on its way from `start`): the explosion on the ground, or the meteor in the air."""
+        if start is None: start = hurtbox
+        x, state = self.x, self.alive * self.state  # dead slots read as WAITING
+        if np.count_nonzero(state) == 0: return state != WAITING  # all still telegraphing
+        # The explosion stays put while the hurtbox's centre moves past it
+        if start.center == hurtbox.center: blast = np.hypot(hurtbox.centerx - x, hurtbox.centery - GROUND_Y)
+        else: blast = points_segment_distance(x, GROUND_Y, start.centerx, start.centery, hurtbox.centerx, hurtbox.centery)
+        hit = (state == IMPACT) & (blast <= self.RADIUS + 20)
+        falling = state == FALLING
+        if np.count_nonzero(falling):
+            # Seen from the hurtbox, the meteor fell from where it was, shifted by the hurtbox's own motion
+            y, mx, my = self.y, hurtbox.x - start.x, hurtbox.y - start.y
+            y0 = self.prev_y + my
+            if mx == 0:  # straight down: the nearest point of the fall is level with the centre, or an end
+                if my > 0: y0, y = np.minimum(y0, y), np.maximum(y0, y)
+                air = rect_points_distance(hurtbox, x, np.clip(hurtbox.centery, y0, y))
+            else:  # only meteors that ended up within the distance moved need the full swept test
+                air = rect_points_distance(hurtbox, x, y)
+                near = falling & (air > 30) & (air <= 30 + abs(mx) + np.abs(y - y0))
+                if np.count_nonzero(near): np.copyto(air, segments_rect_distance(hurtbox, x + mx, y0, x, y), where=near)
+            hit |= falling & (air <= 30)  # slightly larger reach than the sprite
+        return hit
+
+    def colliding(self):
+        return self.alive & (self.state != WAITING)
+
+    def hits(self, hurtbox):
+        return self.hit_mask(hurtbox.volume.rect, hurtbox.volume.start())
+
+    def bounds(self):
+        """Per-slot (left, top, right, bottom) around everything hit_mask() can reach this tick."""
+        r = self.RADIUS + 20 + (GROUND_Y - self.TARGET_Y)  # the blast is centred on GROUND_Y, not y
+        return self.x - r, self.prev_y - r, self.x + r, self.y + r
+
+    def any_waiting(self):
+        return bool((self.alive & (self.state == WAITING)).any())
+
+    def draw(self, screen, offset=(0,0), alpha=1.0):
+        ticks = pygame.time.get_ticks()
+        for i in self.live():
+            x_draw = int(self.x[i] + offset[0])
+            y_draw_g = int(GROUND_Y + offset[1])
+            state = self.state[i]
+
+            # 1. Telegraph (Shadow/Indicator on ground)
+            if state == WAITING:
+                t = max(0.0, min(1.0, 1.0 - self.windup[i] / 1.0))
+                r = self.RADIUS + 10 * (0.8 + 0.2 * math.sin(ticks/150))
+                ring = effect_circle(r, (220,90,40), 100 + 120 * t, 3)
+                screen.blit(ring, ring.get_rect(center=(x_draw, y_draw_g)))
+
+            # 2. Falling Meteor
+            elif state == FALLING:
+                y = self.prev_y[i] + (self.y[i] - self.prev_y[i]) * alpha
+                y_draw_cur = int(y + offset[1])
+                if self.frames:
+                    frame = self.frames[int(self.frame[i]) % len(self.frames)]
+                    screen.blit(frame, (x_draw - frame.get_width() // 2, y_draw_cur - frame.get_height() // 2))
+                else:
+                    # Fallback if image fails to load
+                    mark(screen, pygame.draw.circle(screen, ORANGE, (x_draw, y_draw_cur), 12))
+
+            # 3. Impact (Explosion)
+            else:
+                t = max(0.0, min(1.0, self.impact_timer[i] / self.IMPACT_TIME))
+                blast = effect_circle(self.RADIUS * (1.2 + 1.4 * (1-t)), (240,120,60), 180 * t)
+                screen.blit(blast, blast.get_rect(center=(x_draw, y_draw_g)))
+
+# --- Papia's homing orbs ---
+class Orbs(Projectiles):
+    FIELDS = [
+        ("x", np.float64), ("y", np.float64),
+        ("prev_x", np.float64), ("prev_y", np.float64),
+        ("vx", np.float64), ("vy", np.float64),
+        ("windup", np.float64),  # time until launch
+        ("life", np.float64),    # flight time left once launched
+        ("speed", np.float64),
+        ("launched", np.bool_),
+    ]
+    CAPACITY = 4
+    RADIUS = 20
+    WINDUP = 0.45
+    COLOR = PURPLE
+
+    def spawn(self, x, y, speed=520.0, life=2.0, delay=0.0):
+        return self.activate(x=x, y=y, prev_x=x, prev_y=y, windup=self.WINDUP + delay, life=life, speed=speed)
+
+    def update(self, dt, target):
+        """Wind up, then home in on `target` (a Vector2); spent orbs are dropped."""
+        if len(self) == 0: return
+        alive, x, y, vx, vy = self.alive, self.x, self.y, self.vx, self.vy
+        windup, life, speed, launched = self.windup, self.life, self.speed, self.launched
+        self.prev_x[:] = x
+        self.prev_y[:] = y
+        tx, ty = target.x, target.y
+
+        winding = alive & (windup > 0)
+        np.subtract(windup, dt, out=windup, where=winding)
+        launch = winding & (windup <= 0)
+        if launch.any():
+            dx, dy = tx - x[launch], ty - y[launch]
+            length = np.sqrt(dx * dx + dy * dy)
+            still = length == 0
+            dx[still], dy[still], length[still] = 1.0, 0.0, 1.0
+            vx[launch] = dx / length * speed[launch]
+            vy[launch] = dy / length * speed[launch]
+            launched[launch] = True
+
+        # An orb is dropped on the tick after its life runs out, like before
+        expired = alive & ~winding & (life <= 0)
+        flying = alive & ~winding & ~expired & launched
+        if flying.any():
+            dx, dy = tx - x, ty - y
+            length = np.sqrt(dx * dx + dy * dy)
+            steer = flying & (length > 0.1)
+            t = min(1.0, 2.0 * dt)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                np.add(vx * (1 - t), dx / length * speed * t, out=vx, where=steer)
+                np.add(vy * (1 - t), dy / length * speed * t, out=vy, where=steer)
+            np.add(x, vx * dt, out=x, where=flying)
+            np.add(y, vy * dt, out=y, where=flying)
+            np.clip(x, 0, WIDTH, out=x)
+            np.clip(y, -200, HEIGHT + 200, out=y)
+            np.subtract(life, dt, out=life, where=flying)
+
+        if expired.any(): self.release(expired)
+
+    def box_mask(self, rect, start=None):
+        """Orbs whose 40x40 box overlaps `rect` (moving from `start`) during the tick; what a sword swing can hit."""
+        x, y = np.trunc(self.x - 20), np.trunc(self.y - 20)  # as Rect() would
+        x0, y0 = np.trunc(self.prev_x - 20), np.trunc(self.prev_y - 20)
+        return self.alive & swept_overlap_mask(x0, y0, 40, 40, x - x0, y - y0, rect if start is None else start, rect)
+
+    def bounds(self):
+        """Per-slot bounds around both the 40x40 box and 40px of the centre, from prev to now."""
+        r = 41
+        return (np.minimum(self.prev_x, self.x) - r, np.minimum(self.prev_y, self.y) - r,
+                np.maximum(self.prev_x, self.x) + r, np.maximum(self.prev_y, self.y) + r)
+
+    def hits(self, hurtbox):
+        # Homes in on pos, so that is what it tests: the closest the two came this tick
+        pos, prev = hurtbox.owner.pos, hurtbox.owner.prev_pos
+        closest = points_segment_distance(0.0, 0.0, self.prev_x - prev.x, self.prev_y - prev.y, self.x - pos.x, self.y - pos.y)
+        return self.alive & (closest < 40)
+
+    def struck_by(self, hitbox):
+        return self.box_mask(hitbox.volume.rect, hitbox.volume.start())
+
+    def near_mask(self, pos, distance):
+        dx, dy = self.x - pos.x, self.y - pos.y
+        return self.alive & (np.sqrt(dx * dx + dy * dy) < distance)
+
+    def draw(self, screen, offset=(0,0), alpha=1.0):
+        r0 = self.RADIUS
+        for i in self.live():
+            x_draw = int(self.prev_x[i] + (self.x[i] - self.prev_x[i]) * alpha + offset[0])
+            y_draw = int(self.prev_y[i] + (self.y[i] - self.prev_y[i]) * alpha + offset[1])
+
+            if self.windup[i] > 0:
+                t = max(0.0, min(1.0, 1.0 - self.windup[i] / self.WINDUP))
+                ring = effect_circle(r0 + 10 * (1.0 - t), (140,80,200), 130 * t, 3)
+                screen.blit(ring, ring.get_rect(center=(x_draw, y_draw)))
+            mark(screen, pygame.draw.circle(screen, self.COLOR, (x_draw, y_draw), r0))
+            glow = effect_circle(r0 * 2, (120,60,180), 60)
+            screen.blit(glow, glow.get_rect(center=(x_draw, y_draw)))
+
+# --- Harus' shockwaves ---
+class Shockwaves(Projectiles):
+    FIELDS = [
+        ("x", np.float64), ("prev_x", np.float64),  # left edge; Rects would truncate
+        ("y", np.int32),                             # top edge
+        ("direction", np.int32),
+        ("frame", np.int32), ("anim_timer", np.float64),
+    ]
+    CAPACITY = 8
+    W, H = 80, 60
+    SPEED = 380
+
+    def __init__(self, bank, capacity=None):
+        super().__init__(capacity)
+        self.bank = bank
+        self.frames = {d: bank.frames("wave", d) for d in (1, -1)}
+        self.durations = np.array(bank.durations.get("wave") or [0.1])
+
+    def spawn(self, x, ground_y, direction):
+        return self.activate(x=x, prev_x=x, y=ground_y - 40, direction=direction)
+
+    def update(self, dt):
+        if len(self) == 0: return
+        alive, x, frame, timer = self.alive, self.x, self.frame, self.anim_timer
+        self.prev_x[:] = x
+        np.add(x, self.SPEED * self.direction * dt, out=x, where=alive)
+        left = np.trunc(x)
+        if len(self.durations):
+            timer += dt
+            advance = timer >= self.durations[frame % len(self.durations)]
+            timer[advance] = 0.0
+            frame[advance] = (frame[advance] + 1) % len(self.durations)
+        self.release((left + self.W < 0) | (left > WIDTH))
+
+    def hit_mask(self, rect, start=None):
+        """Waves that overlap `rect` (moving from `start`) at some point during the tick."""
+        left, left0 = np.trunc(self.x), np.trunc(self.prev_x)
+        return self.alive & swept_overlap_mask(left0, self.y, self.W, self.H, left - left0, 0, rect if start is None else start, rect)
+
+    def hits(self, hurtbox):
+        return self.hit_mask(hurtbox.volume.rect, hurtbox.volume.start())
+
+    def bounds(self):
+        left, left0 = np.trunc(self.x), np.trunc(self.prev_x)
+        return np.minimum(left, left0), self.y, np.maximum(left, left0) + self.W, self.y + self.H
+
+    def draw(self, screen, offset=(0,0), alpha=1.0):
+        for i in self.live():
+            x = self.prev_x[i] + (self.x[i] - self.prev_x[i]) * alpha
+            frames = self.frames[int(self.direction[i])]
+            if frames:
+                frame = frames[self.frame[i] % len(frames)]
+                dx = x + self.W // 2 - frame.get_width() // 2 + offset[0]
+                dy = self.y[i] + self.H - frame.get_height() + offset[1]
+                screen.blit(frame, (dx, dy))
+            else:
+                mark(screen, pygame.draw.rect(screen, RED, (int(x) + offset[0], self.y[i] + offset[1], self.W, self.H), 2))
@@ -0,0 +1,79 @@
+import pygame
+from settings import *
+
+# Dirty-rectangle rendering. A frame has two layers: the screen's background
+# (one static, screen-sized surface: the title, the arena, a cutscene slide)
+# and everything drawn over it, which is redrawn every frame. Frames are drawn
+# into a Canvas, which remembers every rect blitted or filled, so the Renderer
+# only has to put back the background under last frame's rects, draw the new
+# frame and hand both sets of rects to pygame.display.update(). A new
+# background, screen shake (the background moves) or a full-screen fade
+# redraws and flips the whole screen instead.
+#
+# Code drawing onto the screen with pygame.draw must mark() what it drew,
+# since only blits and fills record themselves.
+
+from time import perf_counter
+
+class Canvas(pygame.Surface):
+    """Back buffer that records the rect of every blit and fill."""
+    def __init__(self, size):
+        super().__init__(size)
+        self.rects = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = super().blit(source, dest, area, special_flags)
+        self.rects.append(rect)
+        return rect
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = super().fill(color, rect, special_flags)
+        self.rects.append(rect)
+        return rect
+
+def mark(surface, rect):
+    """Record `rect` (e.g. what pygame.draw returned) as drawn; a no-op unless `surface` is a Canvas."""
+    if isinstance(surface, Canvas): surface.rects.append(rect)
+    return rect
+
+class Renderer:
+    """
+    Presents frames of a scene: anything with background() -> (key, surface),
+    needs_full_redraw() and render(surface, alpha, background=True), like Game.
+    The background is redrawn in full only when its key changes.
+    """
+    def __init__(self, display):
+        self.display = display
+        self.canvas = Canvas(display.get_size())
+        self.key = None
+        self.background = None
+        self.stale = []  # rects drawn over the background last frame
+        self.timings = None  # a timings.FrameTimings to time "draw" and "flip" into and draw over the frame
+
+    def draw(self, scene, alpha=1.0):
+        canvas, display, timings = self.canvas, self.display, self.timings
+        since = timings and perf_counter()
+        canvas.rects.clear()
+        key, background = scene.background()
+        if key != self.key or scene.needs_full_redraw():
+            self.key, self.background = key, background
+            scene.render(canvas, alpha)
+            if timings:
+                timings.draw(canvas)
+                since = timings.lap("draw", since)
+            display.blit(canvas, (0, 0))
+            pygame.display.flip()
+            if timings: timings.lap("flip", since)
+            self.stale = [canvas.get_rect()]  # the next partial frame starts from a clean background
+            return
+
+        for rect in self.stale: pygame.Surface.blit(canvas, self.background, rect, rect)
+        scene.render(canvas, alpha, background=False)
+        if timings:
+            timings.draw(canvas)
+            since = timings.lap("draw", since)
+        dirty = self.stale + canvas.rects
+        for rect in dirty: display.blit(canvas, rect, rect)
+        pygame.display.update(dirty)
+        if timings: timings.lap("flip", since)
+        self.stale = canvas.rects[:]
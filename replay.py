@@ -0,0 +1,118 @@
+import pygame, argparse, struct, time
+from settings import *
+
+# Input replays: the seed plus the button mask (controls.py) of every tick.
+# Since the game is deterministic for a given seed and tick rate, that is all
+# it takes to re-run a whole session, e.g. to reproduce a bug or a perf case:
+#
+#     python main.py --record fight.vrp
+#     python replay.py fight.vrp
+#
+# File layout (little endian): header, then runs of identical ticks.
+REPLAY_MAGIC = b"VRP1"
+REPLAY_HEADER = struct.Struct("<4sHIII")  # magic, tick rate, seed, ticks, end-state checksum
+REPLAY_RUN = struct.Struct("<BH")         # buttons, number of ticks they were held
+MAX_RUN = 0xFFFF
+SEED_LIMIT = 1 << 32  # seeds are stored as uint32
+
+def seed_arg(text):
+    """argparse type for a --seed that a replay can store."""
+    try: seed = int(text)
+    except ValueError: raise argparse.ArgumentTypeError(f"seed must be an integer, got '{text}'")
+    if not 0 <= seed < SEED_LIMIT:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and {SEED_LIMIT - 1}, got {seed}")
+    return seed
+
+class Replay:
+    def __init__(self, seed, tick_rate=TICK_RATE, inputs=b"", checksum=0):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.inputs = bytearray(inputs)  # one button mask per tick
+        self.checksum = checksum
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, buttons):
+        self.inputs.append(buttons)
+
+    def save(self, path):
+        runs = bytearray()
+        i = 0
+        while i < len(self.inputs):
+            buttons, run = self.inputs[i], 1
+            while run < MAX_RUN and i + run < len(self.inputs) and self.inputs[i + run] == buttons:
+                run += 1
+            runs += REPLAY_RUN.pack(buttons, run)
+            i += run
+        with open(path, "wb") as f:
+            f.write(REPLAY_HEADER.pack(REPLAY_MAGIC, self.tick_rate, self.seed, len(self.inputs), self.checksum))
+            f.write(runs)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, tick_rate, seed, ticks, checksum = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        inputs = bytearray()
+        for buttons, run in REPLAY_RUN.iter_unpack(data[REPLAY_HEADER.size:]):
+            inputs += bytes((buttons,)) * run
+        if len(inputs) != ticks:
+            raise ValueError(f"{path} is truncated ({len(inputs)} of {ticks} ticks)")
+        return cls(seed, tick_rate, inputs, checksum)
+
+class ReplayController:
+    """Controller that plays back a replay's inputs, then nothing."""
+    def __init__(self, replay):
+        self.inputs = replay.inputs
+        self.tick = 0
+
+    @property
+    def finished(self):
+        return self.tick >= len(self.inputs)
+
+    def poll(self, game):
+        if self.finished: return 0
+        self.tick += 1
+        return self.inputs[self.tick - 1]
+
+class Recorder:
+    """Controller wrapper that records everything `controller` returns."""
+    def __init__(self, controller, replay):
+        self.controller = controller
+        self.replay = replay
+
+    def poll(self, game):
+        buttons = self.controller.poll(game)
+        self.replay.record(buttons)
+        return buttons
+
+def play(replay, game=None):
+    """Step a fresh Game (or `game`) through every tick of `replay`; returns the game."""
+    from game import Game
+    game = game or Game(replay.seed)
+    controller = ReplayController(replay)
+    dt = 1.0 / replay.tick_rate
+    while not controller.finished:
+        game.step(dt, controller.poll(game))
+    return game
+
+if __name__ == "__main__":
+    from game import init_pygame
+    parser = argparse.ArgumentParser(description="Re-simulate a recorded replay without a display")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    init_pygame(headless=True)
+    replay = Replay.load(args.path)
+    start = time.perf_counter()
+    game = play(replay)
+    elapsed = time.perf_counter() - start
+
+    game_time = len(replay) / replay.tick_rate
+    print(f"{len(replay)} ticks ({game_time:.1f}s of play) in {elapsed:.2f}s, {game_time / max(elapsed, 1e-9):.0f}x real time")
+    print(f"Ended in {game.state}, player hp {game.player.hp}")
+    if replay.checksum:
+        print("End state matches the recording" if game.checksum() == replay.checksum else "DESYNC: end state differs from the recording")
@@ -1,8 +1,11 @@
-import pygame
+import pygame, json, mmap, os, struct, threading
+from collections import OrderedDict
 
 # Screen
 WIDTH, HEIGHT = 960, 540
 FPS = 60
+# Simulation steps per second, independent of FPS (see FixedTimestep in game.py)
+TICK_RATE = 120
 
 # CHANGED: Increased GROUND_Y so characters stand lower (closer to bottom)
 # Screen height is 540, so 515 leaves a small 25px margin.
@@ -30,20 +33,220 @@ STATE_GAME_HARUS = "harus_fight"
 STATE_ENDING = "ending"
 STATE_GAMEOVER = "gameover"
 
-def load_strip(path, frame_count, frame_w=None, frame_h=None):
+# --- Baked pixel cache ---
+# `python bake.py` stores every PNG as raw RGBA pixels named by the PNG's
+# content hash, plus an index of (size, mtime, hash) per source. load_image
+# maps the baked file and hands it straight to frombuffer, skipping PNG
+# decoding; anything missing or stale falls back to pygame.image.load.
+PIXEL_CACHE_DIR = "build/pixels"
+PIXEL_INDEX_PATH = os.path.join(PIXEL_CACHE_DIR, "index.json")
+PIXEL_HEADER = struct.Struct("<4sII")  # magic, width, height
+PIXEL_MAGIC = b"VPX1"
+
+_pixel_index = None
+
+def file_stamp(path):
+    st = os.stat(path)
+    return [st.st_size, int(st.st_mtime)]
+
+def _load_baked(path):
+    global _pixel_index
+    if _pixel_index is None:
+        try:
+            with open(PIXEL_INDEX_PATH) as f:
+                _pixel_index = json.load(f)
+        except (OSError, ValueError):
+            _pixel_index = {}
+
+    entry = _pixel_index.get(path)
+    if entry is None: return None
     try:
-        sheet = pygame.image.load(path).convert_alpha()
-        frames = []
+        if entry["stamp"] != file_stamp(path): return None
+        with open(os.path.join(PIXEL_CACHE_DIR, entry["hash"] + ".px"), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, w, h = PIXEL_HEADER.unpack_from(mm)
+                if magic != PIXEL_MAGIC or len(mm) != PIXEL_HEADER.size + w * h * 4:
+                    return None
+                view = memoryview(mm)[PIXEL_HEADER.size:]
+                raw = pygame.image.frombuffer(view, (w, h), "RGBA")
+                surf = raw.convert_alpha()
+                del raw
+                view.release()
+                return surf
+    except (OSError, ValueError):
+        return None
+
+def load_image(path):
+    """pygame.image.load(path).convert_alpha(), served from the baked cache when fresh."""
+    surf = _load_baked(path)
+    if surf is None:
+        surf = pygame.image.load(path).convert_alpha()
+    return surf
+
+# --- Sprite strip cache ---
+# Strips are shared process-wide, keyed by (path, frame count, frame size), so
+# spawning a Meteor or rebuilding the Player on retry never touches the disk.
+# Every entry remembers which scenes asked for it; evict_strips(scene) drops
+# whatever only that scene was using.
+_sheet_cache = {}  # path -> [sheet, scenes]
+_strip_cache = {}  # (path, frame_count, frame_w, frame_h) -> [frames, scenes]
+_strip_stats = {"hits": 0, "misses": 0}
+# The prefetch thread fills these caches while the game loop reads them
+_cache_lock = threading.Lock()
+
+def _surface_bytes(surf):
+    return surf.get_bytesize() * surf.get_width() * surf.get_height()
+
+def load_once(cache, key, lock, decode, claim=None):
+    """
+    (cache[key], whether it was already there), calling decode() to fill it
+    the first time. Shared by the strip, bank and sound caches, which the
+    prefetch thread fills while the game loop reads them: decode() runs
+    outside `lock` so decoding one asset never stalls a lookup of another, and
+    if two threads decode the same key the first one stored wins. Nothing is
+    stored if decode() raises. claim(entry) runs under `lock` in the same step
+    that finds or stores the entry, so an eviction never sees it unclaimed.
+    """
+    with lock:
+        if key in cache:
+            if claim: claim(cache[key])
+            return cache[key], True
+    value = decode()
+    with lock:
+        value = cache.setdefault(key, value)
+        if claim: claim(value)
+        return value, False
+
+def _cut_strip(path, frame_count, frame_w, frame_h, scene):
+    try:
+        sheet = load_once(_sheet_cache, path, _cache_lock, lambda: [load_image(path), set()],
+                          lambda entry: entry[1].add(scene))[0][0]
         if frame_w is None:
             frame_w = sheet.get_width() // frame_count
             frame_h = sheet.get_height()
-            
-        for i in range(frame_count):
-            frame = sheet.subsurface((i * frame_w, 0, frame_w, frame_h))
-            frames.append(frame)
-        return frames
+        return [sheet.subsurface((i * frame_w, 0, frame_w, frame_h)) for i in range(frame_count)]
     except Exception as e:
         print(f"ERROR loading {path}: {e}")
         s = pygame.Surface((frame_w or 64, frame_h or 64))
         s.fill((255, 0, 255))
-        return [s]
\ No newline at end of file
+        return [s]
+
+def load_strip(path, frame_count, frame_w=None, frame_h=None, scene=None):
+    # Missing files get a placeholder that is cached too, so a broken asset only logs once
+    def claim(entry):
+        entry[1].add(scene)
+        if path in _sheet_cache: _sheet_cache[path][1].add(scene)
+    entry, hit = load_once(_strip_cache, (path, frame_count, frame_w, frame_h), _cache_lock,
+                           lambda: [_cut_strip(path, frame_count, frame_w, frame_h, scene), set()], claim)
+    with _cache_lock:
+        _strip_stats["hits" if hit else "misses"] += 1
+    return list(entry[0])
+
+def prime_sheet(path, sheet, scene=None):
+    """Register an already loaded sheet (e.g. an atlas page) with the cache."""
+    with _cache_lock:
+        _sheet_cache.setdefault(path, [sheet, set()])[1].add(scene)
+        return _sheet_cache[path][0]
+
+def prime_strip(path, frame_count, frame_w, frame_h, frames, scene=None):
+    """Seed the cache so load_strip with these arguments returns `frames`."""
+    with _cache_lock:
+        _strip_cache[(path, frame_count, frame_w, frame_h)] = [frames, {scene}]
+
+def strip_cache_stats():
+    size = sum(_surface_bytes(sheet) for sheet, _ in _sheet_cache.values())
+    # Placeholders for missing files own their pixels instead of sharing a sheet
+    size += sum(_surface_bytes(f[0]) for f, _ in _strip_cache.values() if f[0].get_parent() is None)
+    return {
+        "hits": _strip_stats["hits"],
+        "misses": _strip_stats["misses"],
+        "bytes": size,
+        "strips": len(_strip_cache),
+        "sheets": len(_sheet_cache),
+    }
+
+def evict_strips(scene):
+    """Forget every strip and sheet that no scene other than `scene` still uses."""
+    with _cache_lock:
+        for cache in (_strip_cache, _sheet_cache):
+            for key, entry in list(cache.items()):
+                entry[1].discard(scene)
+                if not entry[1]: del cache[key]
+
+# --- Surface caches ---
+class SurfaceLRU:
+    """
+    Surfaces made by make(key) on first use and shared after that; the least
+    recently used one goes once `size` are held. Main thread only, no lock.
+    """
+    def __init__(self, size, make):
+        self.size = size
+        self.make = make
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = self.entries[key] = self.make(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "entries": len(self.entries), "bytes": sum(_surface_bytes(s) for s in self.entries.values())}
+
+# --- Text cache ---
+# Rendered text, shared by every font.render() call site through render_text():
+# captions, prompts and the HUD mostly draw the same strings frame after frame,
+# so glyphs are only rasterized when the text (or font, colour) changes.
+TEXT_CACHE_SIZE = 128
+# (font, text, color, antialias) -> Surface
+_text_cache = SurfaceLRU(TEXT_CACHE_SIZE, lambda key: key[0].render(key[1], key[3], key[2]))
+
+def render_text(font, text, color, antialias=True):
+    """font.render(text, antialias, color), cached. Don't draw onto the result."""
+    return _text_cache.get((font, text, color, antialias))
+
+def text_cache_stats():
+    return _text_cache.stats()
+
+# --- Effect sprite cache ---
+# Telegraph rings, glows and blast discs are plain circles whose radius and
+# alpha animate. Rather than a new SRCALPHA surface and pygame.draw.circle per
+# effect per frame, effect_circle() snaps radius and alpha to steps too small
+# to see and keeps one pre-drawn surface per variant, so an effect is a single
+# blit. Variants follow the effects' animation curves, so only a few dozen are
+# ever drawn; the LRU bound is a backstop.
+EFFECT_RADIUS_STEP = 2
+EFFECT_ALPHA_STEP = 16
+EFFECT_CACHE_SIZE = 256
+
+def _draw_circle(key):
+    radius, rgb, alpha, width = key
+    surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, (*rgb, alpha), (radius, radius), radius, width)
+    return surf
+
+_effect_cache = SurfaceLRU(EFFECT_CACHE_SIZE, _draw_circle)  # (radius, rgb, alpha, width) -> Surface
+
+def effect_circle(radius, color, alpha, width=0):
+    """
+    A (2r, 2r) surface with a circle of `color` at `alpha` centered in it, a
+    ring `width` px thick if width > 0; blit it at its get_rect(center=...).
+    Cached and shared, so don't draw onto it.
+    """
+    radius = max(1, int(radius / EFFECT_RADIUS_STEP + 0.5) * EFFECT_RADIUS_STEP)
+    alpha = min(255, int(alpha / EFFECT_ALPHA_STEP + 0.5) * EFFECT_ALPHA_STEP)
+    return _effect_cache.get((radius, tuple(color[:3]), alpha, width))
+
+def effect_cache_stats():
+    return _effect_cache.stats()
@@ -0,0 +1,150 @@
+import argparse, csv, itertools, json, os, statistics, sys, time
+from concurrent.futures import ProcessPoolExecutor
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # one banner per worker otherwise
+from settings import *
+from controls import BotController
+
+# Batch fight simulator for balancing: runs N seeded fights against one boss
+# across a process pool, with BotController playing and nothing rendered,
+# and aggregates win rate, time-to-kill, damage taken per attack and parry rate.
+#
+#     python simulate.py papia -n 2000 --set orb_speed=480,560,640
+#     python simulate.py harus -n 2000 --set swing_telegraph_time=0.5,0.7 --out harus.csv
+#     python simulate.py papia -n 2000 --tick-rate 60   # half the ticks per fight
+#
+# Every --set value combination runs the same seeds, so rows compare like for like.
+# Hit tests are swept (collision.py), so a lower --tick-rate doesn't let attacks
+# pass through the player between ticks; outcomes still shift a little, since
+# the bot and the bosses decide once per tick.
+
+FIGHT_STATES = {"papia": STATE_GAME_PAPIA, "harus": STATE_GAME_HARUS}
+
+# --- Workers ---
+_game = None
+
+def _init_worker():
+    global _game
+    from game import Game, init_pygame
+    init_pygame(headless=True)
+    _game = Game()
+
+def run_fight(job):
+    """job = (boss name, {tunable: value}, seed, bot skill, max seconds, tick rate) -> per-fight result dict"""
+    boss_name, tunables, seed, skill, max_time, tick_rate = job
+    game = _game
+    game.reseed(seed)
+    bot = BotController(game.rng["bot"], skill)
+    game.reset()
+    game.player.can_dash = True
+    if boss_name == "papia": game.unlock_dash_and_start()
+    else: game.unlock_checkpoint_and_start()
+
+    boss = game.boss
+    for name, value in tunables.items():
+        if not hasattr(boss, name):
+            raise ValueError(f"{type(boss).__name__} has no tunable '{name}'")
+        setattr(boss, name, value)
+
+    dt = 1.0 / tick_rate
+    fight_state = FIGHT_STATES[boss_name]
+    ticks, max_ticks = 0, int(max_time * tick_rate)
+    while game.state == fight_state and ticks < max_ticks:
+        game.step(dt, bot.poll(game))
+        ticks += 1
+
+    won = game.state not in (fight_state, STATE_GAMEOVER)
+    return {
+        "seed": seed,
+        "won": won,
+        "timeout": game.state == fight_state,
+        "seconds": ticks * dt,
+        "hp_left": max(0, game.player.hp),
+        "damage_taken": dict(game.fight_stats["damage_taken"]),
+        "parries": game.fight_stats["parries"],
+        "parry_chances": getattr(boss, "attacks", 0),
+    }
+
+# --- Aggregation ---
+def percentile(values, p):
+    if not values: return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+def summarize(boss_name, tunables, fights):
+    ttk = [f["seconds"] for f in fights if f["won"]]
+    attacks = sorted({name for f in fights for name in f["damage_taken"]})
+    chances = sum(f["parry_chances"] for f in fights)
+    row = {"boss": boss_name, **tunables, "fights": len(fights),
+           "win_rate": sum(f["won"] for f in fights) / len(fights),
+           "timeouts": sum(f["timeout"] for f in fights),
+           "ttk_mean": statistics.mean(ttk) if ttk else None,
+           "ttk_p50": percentile(ttk, 50),
+           "ttk_p90": percentile(ttk, 90),
+           "hp_left_mean": statistics.mean(f["hp_left"] for f in fights),
+           "parry_rate": sum(f["parries"] for f in fights) / chances if chances else None}
+    for name in attacks:
+        row[f"damage_{name}"] = sum(f["damage_taken"].get(name, 0) for f in fights) / len(fights)
+    return row
+
+def parse_value(text):
+    for cast in (int, float):
+        try: return cast(text)
+        except ValueError: pass
+    return text
+
+def parse_sets(pairs):
+    """["orb_speed=480,560", "meteor_count=6"] -> [{"orb_speed": 480, "meteor_count": 6}, ...]"""
+    names, choices = [], []
+    for pair in pairs:
+        name, _, values = pair.partition("=")
+        if not values: raise SystemExit(f"--set expects name=value[,value...], got '{pair}'")
+        names.append(name)
+        choices.append([parse_value(v) for v in values.split(",")])
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+def write_results(path, fmt, rows, fights):
+    if fmt == "json":
+        with open(path, "w") as f:
+            json.dump([{"summary": row, "fights": runs} for row, runs in zip(rows, fights)], f, indent=1)
+        return
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate many bot fights against a boss")
+    parser.add_argument("boss", choices=sorted(FIGHT_STATES))
+    parser.add_argument("-n", "--fights", type=int, default=200, help="fights per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first fight")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=V1[,V2...]",
+                        help="boss attribute to override, e.g. orb_speed=600; commas sweep values")
+    parser.add_argument("--skill", type=float, default=0.75, help="chance the bot reacts to each attack (0-1)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-time", type=float, default=300.0, help="seconds before a fight counts as a timeout")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation ticks per second")
+    parser.add_argument("--out", help="write results to this .csv or .json file")
+    parser.add_argument("--format", choices=["csv", "json"], help="default: from --out's extension")
+    args = parser.parse_args()
+
+    configs = parse_sets(args.set)
+    seeds = range(args.seed, args.seed + args.fights)
+    jobs = [(args.boss, tunables, seed, args.skill, args.max_time, args.tick_rate) for tunables in configs for seed in seeds]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker) as pool:
+        results = list(pool.map(run_fight, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+
+    fights = [results[i:i + args.fights] for i in range(0, len(results), args.fights)]
+    rows = [summarize(args.boss, tunables, runs) for tunables, runs in zip(configs, fights)]
+
+    for row in rows:
+        print(", ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
+    print(f"{len(jobs)} fights in {elapsed:.1f}s ({len(jobs) / elapsed * 60:.0f} per minute, {args.workers} workers)",
+          file=sys.stderr)
+
+    if args.out:
+        fmt = args.format or ("json" if args.out.endswith(".json") else "csv")
+        write_results(args.out, fmt, rows, fights)
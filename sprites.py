@@ -0,0 +1,89 @@
+import pygame, threading
+from settings import *
+
+class AnimationBank:
+    """
+    Every (state, facing, scale) variant of an entity's frames, flipped and
+    scaled once at load time so draw() only has to blit.
+
+    animations = {"idle": [surface, ...], ...}
+    scales     = 2.0, (96, 96) or a list of those; the first is the default
+    durations  = {"idle": [seconds per frame, ...], ...} when the source has them
+    """
+    def __init__(self, animations, scales=1.0, durations=None):
+        if not isinstance(scales, list):
+            scales = [scales]
+        self.default_scale = scales[0]
+        self.durations = durations or {}
+        self.variants = {}
+        self.trims = {}  # (state, facing, scale, index) -> bounding Rect of the opaque pixels
+
+        for state, frames in animations.items():
+            for scale in scales:
+                right = [self._resize(f, scale) for f in frames]
+                left = [pygame.transform.flip(f, True, False) for f in right]
+                self.variants[(state, 1, scale)] = right
+                self.variants[(state, -1, scale)] = left
+
+    @staticmethod
+    def _resize(frame, scale):
+        if isinstance(scale, tuple):
+            size = scale
+        else:
+            size = (int(frame.get_width() * scale), int(frame.get_height() * scale))
+        if size == frame.get_size():
+            return frame
+        return pygame.transform.scale(frame, size)
+
+    def frames(self, state, facing=1, scale=None):
+        return self.variants[(state, facing, self.default_scale if scale is None else scale)]
+
+    def get(self, state, index, facing=1, scale=None):
+        frames = self.frames(state, facing, scale)
+        return frames[index % len(frames)]
+
+    def trim(self, state, index, facing=1, scale=None):
+        """The part of a frame that isn't transparent, worked out on first use.
+        Blitting just that keeps dirty rects (render.py) off the empty margins."""
+        key = (state, facing, scale, index)
+        rect = self.trims.get(key)
+        if rect is None: rect = self.trims[key] = self.get(state, index, facing, scale).get_bounding_rect()
+        return rect
+
+    def duration(self, state, index):
+        durations = self.durations[state]
+        return durations[index % len(durations)]
+
+    def frame_count(self, state):
+        return len(self.variants[(state, 1, self.default_scale)])
+
+def load_strips(strips, scene=None):
+    """
+    {state: (path, frame_count, frame_w, frame_h, seconds per frame)}
+    -> ({state: frames}, {state: durations}), ready for AnimationBank
+    """
+    frames, durations = {}, {}
+    for state, (path, count, frame_w, frame_h, seconds) in strips.items():
+        frames[state] = load_strip(path, count, frame_w, frame_h, scene=scene)
+        durations[state] = [seconds] * len(frames[state])
+    return frames, durations
+
+# --- Shared banks ---
+# Building a bank (especially Harus at 2x) costs more than loading its strips,
+# so banks are shared per process like strips and can be built ahead of time
+# on the prefetch thread. Scene bookkeeping mirrors load_strip.
+_banks = {}  # name -> [bank, scenes]
+_bank_lock = threading.Lock()
+
+def load_bank(name, build, scene=None):
+    """Return the bank called `name`, calling build() the first time."""
+    entry, _ = load_once(_banks, name, _bank_lock, lambda: [build(), set()], lambda entry: entry[1].add(scene))
+    return entry[0]
+
+def evict_scene(scene):
+    """Drop the banks and strips only `scene` was using."""
+    with _bank_lock:
+        for name, entry in list(_banks.items()):
+            entry[1].discard(scene)
+            if not entry[1]: del _banks[name]
+    evict_strips(scene)
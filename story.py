@@ -1,9 +1,15 @@
 import pygame
+from collections import namedtuple
 from settings import *
+from controls import LEFT, RIGHT, CONFIRM
+
+# A slide as drawn: the image at screen size and the caption pre-composited with its shadow
+Slide = namedtuple("Slide", "image caption caption_pos duration")
 
 class CutsceneManager:
-    def __init__(self, screen):
-        self.screen = screen
+    FADE_SPEED = 1000  # alpha per second: a fade or crossfade takes about a quarter second
+
+    def __init__(self):
         try:
             # Try loading a custom pixel/medieval font if available
             self.font = pygame.font.Font("assets/font.ttf", 28)
@@ -16,6 +22,13 @@ class CutsceneManager:
         self.timer = 0
         self.finished = False
         self.fade_alpha = 0
+        self.blank = pygame.Surface((WIDTH, HEIGHT))
+        self.blank.fill(BLACK)
+        # What is fading out (black, or the previous slide), drawn over the slide at fade_alpha.
+        # update() only notes what that is; draw() paints it, so stepping headless never renders
+        self.fade = pygame.Surface((WIDTH, HEIGHT))
+        self.fade_from = None   # the slide being faded out, None for black
+        self.fade_stale = False # fade doesn't show fade_from yet
 
     def start_sequence(self, sequence_data):
         """
@@ -24,18 +37,33 @@ class CutsceneManager:
             ...
         ]
         """
-        self.scenes = sequence_data
+        self.scenes = [self.prepare(data) for data in sequence_data]
         self.current_index = 0
-        self.timer = sequence_data[0]["duration"]
+        self.timer = self.scenes[0].duration
         self.finished = False
+        self.fade_from, self.fade_stale = None, True
         self.fade_alpha = 255
 
+    def prepare(self, data):
+        """Scale the slide's image and render its caption, once."""
+        image = data.get("image")
+        if not image: image = self.blank
+        elif image.get_size() != (WIDTH, HEIGHT): image = pygame.transform.scale(image, (WIDTH, HEIGHT))
+        caption = pos = None
+        if data.get("text"):
+            # Centered at the bottom, with the shadow 2px below
+            text = render_text(self.font, data["text"], WHITE)
+            caption = pygame.Surface((text.get_width(), text.get_height() + 2), pygame.SRCALPHA)
+            caption.blit(render_text(self.font, data["text"], BLACK), (0, 2))
+            caption.blit(text, (0, 0))
+            pos = text.get_rect(center=(WIDTH//2, HEIGHT - 50)).topleft
+        return Slide(image, caption, pos, data["duration"])
+
     def update(self, dt):
         if self.finished: return
 
-        # Simple fade-in effect logic (optional polish)
         if self.fade_alpha > 0:
-            self.fade_alpha -= 1000 * dt
+            self.fade_alpha -= self.FADE_SPEED * dt
             if self.fade_alpha < 0: self.fade_alpha = 0
 
         self.timer -= dt
@@ -44,47 +72,38 @@ class CutsceneManager:
             if self.current_index >= len(self.scenes):
                 self.finished = True
             else:
-                self.timer = self.scenes[self.current_index]["duration"]
-                self.fade_alpha = 255 # Reset fade for next slide
+                # Crossfade: the slide we are leaving fades out over the new one
+                self.fade_from, self.fade_stale = self.scenes[self.current_index - 1], True
+                self.timer = self.scenes[self.current_index].duration
+                self.fade_alpha = 255
+
+    def background(self):
+        """(key, surface) for the current slide's image, or black."""
+        if self.finished: return "slide-blank", self.blank
+        return ("slide", id(self.scenes), self.current_index), self.scenes[self.current_index].image
+
+    @staticmethod
+    def draw_slide(screen, slide):
+        screen.blit(slide.image, (0, 0))
+        if slide.caption: screen.blit(slide.caption, slide.caption_pos)
 
-    def draw(self):
+    def draw(self, screen):
+        """Draw the caption and any fade over background()."""
         if self.finished: return
         
-        data = self.scenes[self.current_index]
-        
-        # 1. Draw Image
-        if data.get("image"):
-            # Scale to fit screen
-            img = data["image"]
-            img = pygame.transform.scale(img, (WIDTH, HEIGHT))
-            self.screen.blit(img, (0,0))
-        else:
-            self.screen.fill(BLACK)
-        
-        # 2. Draw Text (Centered at bottom with shadow)
-        if data.get("text"):
-            text_str = data["text"]
-            
-            # Shadow
-            shad = self.font.render(text_str, True, BLACK)
-            shad_rect = shad.get_rect(center=(WIDTH//2, HEIGHT - 50 + 2))
-            self.screen.blit(shad, shad_rect)
-            
-            # Main Text
-            surf = self.font.render(text_str, True, WHITE)
-            rect = surf.get_rect(center=(WIDTH//2, HEIGHT - 50))
-            self.screen.blit(surf, rect)
+        slide = self.scenes[self.current_index]
+        if slide.caption: screen.blit(slide.caption, slide.caption_pos)
 
-        # 3. Fade Transition
         if self.fade_alpha > 0:
-            fade = pygame.Surface((WIDTH, HEIGHT))
-            fade.fill(BLACK)
-            fade.set_alpha(int(self.fade_alpha))
-            self.screen.blit(fade, (0,0))
+            if self.fade_stale:
+                if self.fade_from: self.draw_slide(self.fade, self.fade_from)
+                else: self.fade.fill(BLACK)
+                self.fade_stale = False
+            self.fade.set_alpha(int(self.fade_alpha))
+            screen.blit(self.fade, (0,0))
 
 class DialogueSystem:
-    def __init__(self, screen):
-        self.screen = screen
+    def __init__(self):
         try:
             self.font = pygame.font.Font("assets/font.ttf", 22)
         except:
@@ -96,6 +115,15 @@ class DialogueSystem:
         self.choices = ["YES", "NO"]
         self.selected_index = 0
         self.on_confirm = None 
+        self.boxes = {}  # (w, h) -> translucent box background, built once
+
+    def box(self, size):
+        s = self.boxes.get(size)
+        if s is None:
+            s = self.boxes[size] = pygame.Surface(size)
+            s.set_alpha(220)
+            s.fill((20, 20, 20))
+        return s
 
     def start_dialogue(self, text, callback_yes, refusal_text="I won't turn back."):
         self.active = True
@@ -104,15 +132,16 @@ class DialogueSystem:
         self.on_confirm = callback_yes
         self.selected_index = 0
 
-    def handle_input(self, event):
+    def handle_input(self, pressed):
+        """pressed = controls.py buttons that went down this tick"""
         if not self.active: return
         
-        if event.type == pygame.KEYDOWN:
-            if event.key in [pygame.K_a, pygame.K_LEFT]:
+        if pressed:
+            if pressed & LEFT:
                 self.selected_index = 0
-            elif event.key in [pygame.K_d, pygame.K_RIGHT]:
+            elif pressed & RIGHT:
                 self.selected_index = 1
-            elif event.key == pygame.K_SPACE:
+            elif pressed & CONFIRM:
                 if self.selected_index == 0: # YES
                     self.active = False
                     if self.on_confirm: self.on_confirm()
@@ -121,7 +150,7 @@ class DialogueSystem:
                     self.text = self.refusal_text
                     self.selected_index = 0 # Reset cursor to YES to force them eventually
 
-    def draw(self):
+    def draw(self, screen):
         if not self.active: return
         
         # Draw Box (Centered)
@@ -129,21 +158,18 @@ class DialogueSystem:
         box_rect = pygame.Rect((WIDTH - box_w)//2, (HEIGHT - box_h)//2, box_w, box_h)
         
         # Background with slight transparency
-        s = pygame.Surface((box_w, box_h))
-        s.set_alpha(220)
-        s.fill((20, 20, 20))
-        self.screen.blit(s, (box_rect.x, box_rect.y))
+        screen.blit(self.box((box_w, box_h)), (box_rect.x, box_rect.y))
         
         # Border
-        pygame.draw.rect(self.screen, (150, 150, 150), box_rect, 3)
+        pygame.draw.rect(screen, (150, 150, 150), box_rect, 3)
         
         # Draw Main Text (Wrapped)
         lines = self.text.split('\n')
         y_off = 40
         for line in lines:
-            surf = self.font.render(line, True, WHITE)
+            surf = render_text(self.font, line, WHITE)
             rect = surf.get_rect(center=(WIDTH//2, box_rect.y + y_off))
-            self.screen.blit(surf, rect)
+            screen.blit(surf, rect)
             y_off += 30
             
         # Draw Choices
@@ -151,12 +177,12 @@ class DialogueSystem:
         
         # YES
         col_yes = (255, 215, 0) if self.selected_index == 0 else (100, 100, 100)
-        yes_txt = self.font.render(f"> YES <" if self.selected_index == 0 else "  YES  ", True, col_yes)
+        yes_txt = render_text(self.font, "> YES <" if self.selected_index == 0 else "  YES  ", col_yes)
         yes_rect = yes_txt.get_rect(center=(box_rect.centerx - 80, y_choice))
-        self.screen.blit(yes_txt, yes_rect)
+        screen.blit(yes_txt, yes_rect)
 
         # NO
         col_no = (255, 215, 0) if self.selected_index == 1 else (100, 100, 100)
-        no_txt = self.font.render(f"> NO <" if self.selected_index == 1 else "  NO  ", True, col_no)
+        no_txt = render_text(self.font, "> NO <" if self.selected_index == 1 else "  NO  ", col_no)
         no_rect = no_txt.get_rect(center=(box_rect.centerx + 80, y_choice))
-        self.screen.blit(no_txt, no_rect)
\ No newline at end of file
+        screen.blit(no_txt, no_rect)
\ No newline at end of file
@@ -0,0 +1,46 @@
+import array, math, os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+import pygame
+from bake import SILENCE_PAD, trim_silence, write_adpcm_wav
+from audio import MIXER_FREQUENCY, MIXER_SIZE, MIXER_OUTPUT_CHANNELS
+
+CHANNELS = MIXER_OUTPUT_CHANNELS
+
+def stereo(mono):
+    return array.array("h", [s for s in mono for _ in range(CHANNELS)])
+
+@pytest.fixture
+def mixer():
+    pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, CHANNELS)
+    yield
+    pygame.mixer.quit()
+
+def test_trim_keeps_the_lead_in_and_cuts_the_tail():
+    lead, sound, tail = [0] * 3000, [5000, -5000] * 500, [20] * 9000
+    trimmed = trim_silence(stereo(lead + sound + tail), CHANNELS)
+    pad = int(SILENCE_PAD * MIXER_FREQUENCY)
+    assert trimmed[:len(lead + sound) * CHANNELS] == stereo(lead + sound)
+    assert len(trimmed) == (len(lead + sound) + pad) * CHANNELS
+    assert len(trim_silence(stereo(tail), CHANNELS)) == 0
+
+def test_adpcm_loop_decodes_to_its_length_within_the_error_bound(mixer, tmp_path):
+    # Not a whole number of ADPCM blocks, so the padded last block is covered too
+    frames = 12345
+    mono = [int(8000 * math.sin(math.tau * 126 * i / frames)) for i in range(frames)]  # loops seamlessly
+    path = str(tmp_path / "loop.adpcm.wav")
+    write_adpcm_wav(path, stereo(mono), CHANNELS, MIXER_FREQUENCY)
+
+    decoded = array.array("h", pygame.mixer.Sound(path).get_raw())
+    if sys.byteorder == "big": decoded.byteswap()
+    # The length is only rounded up to a whole group of 8 samples, with the loop's first frames
+    extra = len(decoded) // CHANNELS - frames
+    assert 0 <= extra < 8
+    error = [abs(a - b) for a, b in zip(decoded, stereo(mono + mono[:extra]), strict=True)]
+    # The step size starts at its smallest and takes a few samples to catch up
+    settle = 16 * CHANNELS
+    assert max(error[:settle]) < 2500 and max(error[settle:]) < 200
+    assert sum(error) / len(error) < 50
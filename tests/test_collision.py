@@ -0,0 +1,123 @@
+import math, os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+from collision import ArcVolume, RectVolume, CollisionWorld, CELL, PLAYER, sector_meets_rect
+from projectiles import Projectiles
+
+def make_arc(start, end, reach=100, radius=20):
+    arc = ArcVolume(reach, radius)
+    arc.start, arc.end, arc.active = start, end, True
+    return arc
+
+def test_arc_hits_body_moving_through_the_swing():
+    # The body crosses the tip's path during the tick and ends up above it
+    arc = make_arc(-10, 10)
+    body = RectVolume(pygame.Rect(90, -150, 40, 80))
+    body.prev = pygame.Rect(90, 70, 40, 80)
+    assert arc.overlaps(RectVolume(pygame.Rect(90, -40, 40, 80)))  # where it was mid-tick
+    assert arc.overlaps(body)
+
+def test_arc_misses_body_clear_of_the_swing():
+    arc = make_arc(-10, 10)
+    body = RectVolume(pygame.Rect(200, -150, 40, 80))
+    body.prev = pygame.Rect(200, 70, 40, 80)
+    assert not arc.overlaps(body)
+
+def sampled_sector_meets_rect(rect, center, inner, outer, a0, a1, step=0.25):
+    """Brute force: does any sample point of `rect` (edges included) lie in the sector?"""
+    xs = np.arange(rect.left, rect.right + step / 2, step)
+    ys = np.arange(rect.top, rect.bottom + step / 2, step)
+    x, y = np.meshgrid(xs - center[0], ys - center[1])
+    distance = np.hypot(x, y)
+    angle = (np.arctan2(y, x) - a0) % math.tau
+    return bool(((distance >= inner) & (distance <= outer) & (angle <= a1 - a0)).any())
+
+def test_sector_meets_rect_matches_brute_force():
+    rng = random.Random(19)
+    for _ in range(400):
+        rect = pygame.Rect(rng.randint(-120, 100), rng.randint(-120, 100), rng.randint(1, 60), rng.randint(1, 60))
+        inner = rng.uniform(0, 80)
+        outer = inner + rng.uniform(1, 40)
+        a0 = rng.uniform(-math.pi, math.pi)
+        a1 = a0 + rng.uniform(0, math.tau - 0.01)
+        exact = sector_meets_rect(rect, (0, 0), inner, outer, a0, a1)
+        # Sampling can miss a sliver, so a hit only has to show up once the rect grows by a pixel
+        if sampled_sector_meets_rect(rect, (0, 0), inner, outer, a0, a1): assert exact, (rect, inner, outer, a0, a1)
+        if exact: assert sampled_sector_meets_rect(rect.inflate(2, 2), (0, 0), inner, outer, a0, a1), (rect, inner, outer, a0, a1)
+
+class Owner:
+    def update_volumes(self): pass
+
+class CountingVolume(RectVolume):
+    tests = 0
+    def overlaps(self, other):
+        CountingVolume.tests += 1
+        return super().overlaps(other)
+
+class Dots(Projectiles):
+    """Point projectiles at (x, y) that count their narrowphase calls."""
+    FIELDS = [("x", np.float64), ("y", np.float64)]
+    tests = 0
+    def bounds(self): return self.x, self.y, self.x, self.y
+    def hits(self, hurtbox):
+        self.tests += 1
+        return self.alive.copy()
+    def struck_by(self, hitbox): return np.zeros(self.capacity, np.bool_)
+
+def test_broadphase_skips_pairs_in_different_cells():
+    world, owner = CollisionWorld(), Owner()
+    body = RectVolume(pygame.Rect(10, 10, 40, 40))
+    blade = CountingVolume(pygame.Rect(3 * CELL + 10, 10, 40, 40))
+    dots = Dots()
+    far = dots.activate(x=5 * CELL, y=5 * CELL)
+    world.hurtbox(owner, PLAYER, body)
+    world.hitbox(owner, "blade", PLAYER, blade)
+    world.hitbox(owner, "dots", PLAYER, pool=dots)
+    CountingVolume.tests = 0
+    assert world.step() == [] and world.candidates() == {}
+    assert CountingVolume.tests == 0 and dots.tests == 0
+
+    # Once they share a cell the narrowphase runs, and only on the slots that do
+    blade.rect.x = 30
+    near = dots.activate(x=20, y=20)
+    contacts = world.step()
+    assert CountingVolume.tests == 1 and dots.tests == 1
+    assert [c.hitbox.kind for c in contacts] == ["blade", "dots"]
+    assert contacts[1].slots[near] and not contacts[1].slots[far]
+
+# A dash at a low tick rate or after a hitch can carry a body clean past a thin
+# volume within one tick: neither end of the move overlaps it, the path does
+def moved(start, end):
+    body = RectVolume(pygame.Rect(end))
+    body.prev = pygame.Rect(start)
+    return body
+
+def test_fast_body_passing_a_thin_rect_still_hits():
+    thin = RectVolume(pygame.Rect(300, 300, 4, 80))
+    body = moved((200, 300, 40, 80), (400, 300, 40, 80))
+    assert not thin.rect.colliderect(body.rect) and not thin.rect.colliderect(body.prev)
+    assert body.overlaps(thin) and thin.overlaps(body)
+    assert not moved((200, 100, 40, 80), (400, 100, 40, 80)).overlaps(thin)  # passing above it
+
+    world, owner = CollisionWorld(), Owner()
+    world.hurtbox(owner, PLAYER, body)
+    world.hitbox(owner, "thin", PLAYER, thin)
+    assert [c.hitbox.kind for c in world.step()] == ["thin"]
+
+def test_fast_body_passing_the_axe_arc_still_hits():
+    # Harus' axe (reach 160, tip radius 28) barely turning this tick: a sliver straight down
+    arc = ArcVolume(160, 28)
+    arc.center.update(500, 200)
+    arc.start, arc.end, arc.active = 88, 92, True
+    body = moved((380, 330, 40, 80), (580, 330, 40, 80))
+    assert not arc.overlaps(RectVolume(body.rect)) and not arc.overlaps(RectVolume(body.prev))
+    assert arc.overlaps(body)
+    assert not arc.overlaps(moved((380, 430, 40, 80), (580, 430, 40, 80)))  # below the tip's reach
+
+    world, owner = CollisionWorld(), Owner()
+    world.hurtbox(owner, PLAYER, body)
+    world.hitbox(owner, "swing", PLAYER, arc)
+    assert [c.hitbox.kind for c in world.step()] == ["swing"]
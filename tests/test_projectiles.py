@@ -0,0 +1,127 @@
+import os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import math, random
+from collections import namedtuple
+import numpy as np
+import pygame
+import pytest
+from pygame.math import Vector2
+from collision import swept_overlap
+from projectiles import Meteors, Orbs, Projectiles, Shockwaves, WAITING, FALLING, IMPACT
+from settings import GROUND_Y
+
+Owner = namedtuple("Owner", "pos prev_pos")
+Hurtbox = namedtuple("Hurtbox", "owner")
+
+class FakeBank:
+    durations = {}
+    def frames(self, state, direction): return []
+
+def test_full_pool_grows_instead_of_dropping_spawns():
+    meteors = Meteors([], capacity=2)
+    slots = [meteors.spawn(100 + 10 * i) for i in range(5)]
+    assert sorted(slots) == [0, 1, 2, 3, 4]
+    assert len(meteors) == 5 and meteors.capacity == 8
+    assert list(meteors.x[slots]) == [100, 110, 120, 130, 140]
+    assert (meteors.state[slots] == WAITING).all()
+
+    meteors.release(meteors.alive & (meteors.x < 120))
+    assert meteors.spawn(200) in (0, 1)  # freed slots are reused before the grown ones
+
+def test_pool_without_a_hit_test_fails_at_construction():
+    class Sparks(Projectiles):
+        def bounds(self): return self.alive, self.alive, self.alive, self.alive
+    with pytest.raises(TypeError):
+        Sparks()
+
+def test_release_and_spawn_on_a_full_pool():
+    orbs = Orbs()
+    slots = [orbs.spawn(10 * i, 0) for i in range(orbs.CAPACITY)]
+    assert len(orbs) == orbs.capacity == Orbs.CAPACITY and not orbs.free
+
+    # A slot freed from a full pool is reused before the pool grows
+    orbs.release(orbs.x == 20)
+    assert len(orbs) == Orbs.CAPACITY - 1
+    assert orbs.spawn(999, 0) == slots[2] and orbs.capacity == Orbs.CAPACITY
+
+    # Releasing dead slots again frees nothing twice
+    orbs.release(orbs.alive)
+    orbs.release(np.ones(orbs.capacity, np.bool_))
+    assert len(orbs) == 0 and sorted(orbs.free) == list(range(Orbs.CAPACITY))
+
+    for i in range(Orbs.CAPACITY + 1): orbs.spawn(i, 0)
+    assert orbs.capacity == 2 * Orbs.CAPACITY and len(orbs) == Orbs.CAPACITY + 1
+    assert sorted(orbs.x[orbs.live()]) == list(range(Orbs.CAPACITY + 1))
+
+def random_rect_motion(rng):
+    rect = pygame.Rect(rng.randint(0, 600), rng.randint(200, 500), 40, 80)
+    return rect.move(-rng.randint(-60, 60), -rng.randint(-60, 60)), rect
+
+def point_rect_distance(x, y, left, top, w, h):
+    dx = max(left - x, x - (left + w), 0)
+    dy = max(top - y, y - (top + h), 0)
+    return math.hypot(dx, dy)
+
+def sampled_min(distance, steps=200):
+    return min(distance(t / steps) for t in range(steps + 1))
+
+def test_box_masks_match_swept_overlap():
+    rng = random.Random(14)
+    waves, orbs = Shockwaves(FakeBank(), capacity=2), Orbs(capacity=2)
+    for _ in range(40):
+        waves.spawn(rng.uniform(0, 700), rng.randint(300, 560), rng.choice((1, -1)))
+        orbs.spawn(rng.uniform(0, 700), rng.uniform(200, 560))
+    waves.prev_x[:] = waves.x + rng.uniform(-40, 40)
+    orbs.prev_x[:], orbs.prev_y[:] = orbs.x + rng.uniform(-40, 40), orbs.y + rng.uniform(-40, 40)
+    for _ in range(200):
+        start, rect = random_rect_motion(rng)
+        expected = [swept_overlap(pygame.Rect(int(waves.prev_x[i]), waves.y[i], waves.W, waves.H),
+                                  pygame.Rect(int(waves.x[i]), waves.y[i], waves.W, waves.H), start, rect)
+                    for i in range(waves.capacity)]
+        assert list(waves.hit_mask(rect, start)) == expected
+        expected = [swept_overlap(pygame.Rect(int(orbs.prev_x[i] - 20), int(orbs.prev_y[i] - 20), 40, 40),
+                                  pygame.Rect(int(orbs.x[i] - 20), int(orbs.y[i] - 20), 40, 40), start, rect)
+                    for i in range(orbs.capacity)]
+        assert list(orbs.box_mask(rect, start)) == expected
+
+def test_distance_masks_match_sampling():
+    # Both sides move in straight lines during a tick, so sampling the tick finely
+    # gives the closest approach; cases within a pixel of the reach are skipped
+    rng = random.Random(41)
+    meteors, orbs = Meteors([], capacity=2), Orbs(capacity=2)
+    for _ in range(40):
+        i = meteors.spawn(rng.uniform(0, 700))
+        meteors.state[i] = rng.choice((FALLING, IMPACT))
+        meteors.prev_y[i] = rng.uniform(-80, Meteors.TARGET_Y)
+        meteors.y[i] = min(Meteors.TARGET_Y, meteors.prev_y[i] + rng.uniform(0, 80))
+        i = orbs.spawn(rng.uniform(0, 700), rng.uniform(200, 560))
+        orbs.prev_x[i], orbs.prev_y[i] = orbs.x[i] + rng.uniform(-40, 40), orbs.y[i] + rng.uniform(-40, 40)
+    checked = 0
+    for _ in range(40):
+        start, rect = random_rect_motion(rng)
+        lerp = lambda a, b, t: a + (b - a) * t
+        meteor_mask = meteors.hit_mask(rect, start)
+        for i in range(meteors.capacity):
+            if meteors.state[i] == IMPACT:
+                reach = Meteors.RADIUS + 20
+                d = sampled_min(lambda t: math.hypot(lerp(start.centerx, rect.centerx, t) - meteors.x[i],
+                                                     lerp(start.centery, rect.centery, t) - GROUND_Y))
+            else:
+                reach = 30
+                d = sampled_min(lambda t: point_rect_distance(meteors.x[i], lerp(meteors.prev_y[i], meteors.y[i], t),
+                                                              lerp(start.x, rect.x, t), lerp(start.y, rect.y, t), 40, 80))
+            if abs(d - reach) > 1:
+                assert meteor_mask[i] == (d <= reach), (i, start, rect)
+                checked += 1
+
+        owner = Owner(Vector2(rect.center), Vector2(start.center))
+        orb_mask = orbs.hits(Hurtbox(owner))
+        for i in range(orbs.capacity):
+            d = sampled_min(lambda t: math.hypot(lerp(orbs.prev_x[i], orbs.x[i], t) - lerp(owner.prev_pos.x, owner.pos.x, t),
+                                                 lerp(orbs.prev_y[i], orbs.y[i], t) - lerp(owner.prev_pos.y, owner.pos.y, t)))
+            if abs(d - 40) > 1:
+                assert orb_mask[i] == (d < 40), (i, start, rect)
+                checked += 1
+    assert checked > 2000
@@ -0,0 +1,29 @@
+import os, sys
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from settings import STATE_GAME_PAPIA, TICK_RATE
+from controls import BotController
+from replay import Recorder, Replay, play
+
+def test_recorded_bot_fight_plays_back_to_the_same_checksum(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)  # assets load relative to the repo
+    from game import Game, init_pygame
+    init_pygame(headless=True)
+
+    game = Game(1234)
+    recording = Replay(game.seed)
+    controller = Recorder(BotController(game.rng["bot"]), recording)
+    fought = 0
+    while fought < 10 * TICK_RATE and len(recording) < 60 * TICK_RATE:
+        game.step(1.0 / TICK_RATE, controller.poll(game))
+        fought += game.state == STATE_GAME_PAPIA
+    assert fought, "the bot never reached the fight"
+    recording.checksum = game.checksum()
+    path = str(tmp_path / "fight.vrp")
+    recording.save(path)
+
+    loaded = Replay.load(path)
+    assert (loaded.seed, loaded.inputs, loaded.checksum) == (recording.seed, recording.inputs, recording.checksum)
+    assert play(loaded).checksum() == recording.checksum
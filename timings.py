@@ -0,0 +1,115 @@
+import pygame
+from collections import deque
+from time import perf_counter
+from settings import *
+
+# Frame timing overlay, toggled with F3 in main.py. While it is on, main.py,
+# Game.update_fight and the Renderer time their phases into a FrameTimings
+# with lap(); end_frame() files the frame, and draw() shows rolling p50/p95/p99
+# milliseconds per phase over the last WINDOW frames, the live projectiles and
+# the surfaces allocated per frame. Phases that run per tick (player, boss,
+# collision) add up over the frame's ticks. Everything else passes
+# timings=None and skips the clock.
+#
+# Surfaces are counted by swapping pygame.Surface and the pygame.transform
+# functions for counting wrappers while the overlay is on. Font.render can't
+# be wrapped (it's a C type), but every game font.render goes through
+# render_text, so its cache misses are added. The panel's own surfaces are
+# made with the originals and aren't counted.
+
+PHASES = ("events", "player", "boss", "collision", "draw", "flip")
+POOLS = ("meteors", "orbs", "shockwaves")
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+_Surface = pygame.Surface
+_TRANSFORMS = {name: getattr(pygame.transform, name) for name in ("flip", "scale", "smoothscale", "rotate", "rotozoom")}
+_created = 0  # surfaces made through the wrappers
+
+class _CountedSurface(pygame.Surface):
+    def __init__(self, *args, **kwargs):
+        global _created
+        _created += 1
+        super().__init__(*args, **kwargs)
+
+def _counted(transform):
+    def counted(*args, **kwargs):
+        global _created
+        _created += 1
+        return transform(*args, **kwargs)
+    return counted
+
+def count_surfaces(on):
+    """Install (or, with on=False, remove) the counting wrappers."""
+    pygame.Surface = _CountedSurface if on else _Surface
+    for name, transform in _TRANSFORMS.items():
+        setattr(pygame.transform, name, _counted(transform) if on else transform)
+
+def _surfaces():
+    return _created + text_cache_stats()["misses"]
+
+class FrameTimings:
+    WINDOW = 240     # frames the percentiles cover (4 seconds at 60 FPS)
+    REFRESH = 0.5    # seconds between redraws of the panel, so it stays readable
+
+    def __init__(self):
+        self.font = pygame.font.SysFont("monospace", 15)
+        self.history = {phase: deque(maxlen=self.WINDOW) for phase in PHASES + ("total",)}
+        self.surfaces = deque(maxlen=self.WINDOW)
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.counts = {}
+        count_surfaces(True)
+        self.created = _surfaces()
+        self.panel = None
+        self.refreshed = 0.0
+
+    def close(self):
+        count_surfaces(False)
+
+    def lap(self, phase, since):
+        """Add the time since `since` to `phase`; returns now, to time the next phase from."""
+        now = perf_counter()
+        self.current[phase] += now - since
+        return now
+
+    def end_frame(self, game):
+        total = 0.0
+        for phase, seconds in self.current.items():
+            self.history[phase].append(seconds)
+            self.current[phase] = 0.0
+            total += seconds
+        self.history["total"].append(total)
+
+        created = _surfaces()
+        self.surfaces.append(created - self.created)
+        self.created = created
+        boss = game.boss
+        self.counts = {name: len(getattr(boss, name)) for name in POOLS if hasattr(boss, name)}
+
+    def lines(self):
+        lines = ["ms/frame       p50     p95     p99"]
+        for phase, times in self.history.items():
+            if not times: continue
+            times = sorted(times)
+            lines.append(f"{phase:<10}" + "".join(f"{percentile(times, p) * 1000:8.2f}" for p in (50, 95, 99)))
+        if self.surfaces:
+            lines.append(f"surfaces/frame  avg {sum(self.surfaces) / len(self.surfaces):.2f}  max {max(self.surfaces)}")
+        if self.counts:
+            lines.append("  ".join(f"{name} {count}" for name, count in self.counts.items()))
+        return lines
+
+    def draw(self, screen):
+        """Blit the panel top-center; its text is re-rendered every REFRESH seconds."""
+        now = perf_counter()
+        if self.panel is None or now - self.refreshed >= self.REFRESH:
+            self.refreshed = now
+            # Rendered directly rather than through render_text: the numbers
+            # change every refresh and would only churn the text cache
+            texts = [self.font.render(line, True, WHITE) for line in self.lines()]
+            self.panel = _Surface((max(t.get_width() for t in texts) + 16, 16 * len(texts) + 12))
+            self.panel.fill(BLACK)
+            self.panel.set_alpha(200)
+            for i, text in enumerate(texts): self.panel.blit(text, (8, 6 + 16 * i))
+        screen.blit(self.panel, ((WIDTH - self.panel.get_width()) // 2, 8))